@@ -1,44 +1,115 @@
 import os
 import json
+import time
 from datetime import datetime, timedelta
 from http.server import BaseHTTPRequestHandler
-from supabase import create_client
-import pytz
-
-# Supabase 클라이언트 초기화
-supabase = create_client(
-    os.environ.get("SUPABASE_URL", ""),
-    os.environ.get("SUPABASE_KEY", "")
-)
+from zoneinfo import ZoneInfo
+
+KST = ZoneInfo('Asia/Seoul')
+
+# Supabase가 느려도 Slack 3초 제한 안에 응답하도록 DB 요청 타임아웃을 짧게 둠
+DB_TIMEOUT = float(os.environ.get("ONCALL_DB_TIMEOUT", "2"))
+
+# Supabase 클라이언트 (첫 DB 요청 때 생성, GET 헬스체크는 supabase를 import하지 않음)
+supabase = None
+
+def get_supabase():
+    global supabase
+    if supabase is None:
+        from supabase import create_client, ClientOptions
+        supabase = create_client(
+            os.environ.get("SUPABASE_URL", ""),
+            os.environ.get("SUPABASE_KEY", ""),
+            options=ClientOptions(postgrest_client_timeout=DB_TIMEOUT)
+        )
+    return supabase
+
+# /온콜리스트 스케줄 캐시 (Slack 응답과 "마지막 업데이트" 시각은 응답할 때마다 새로 만든다)
+# 1) warm 인스턴스 메모리 (KST 날짜 → (만료 시각, 스케줄)), ONCALL_CACHE_TTL 초 동안 DB 조회 없이 응답
+# 2) Supabase oncall_list_cache 테이블의 미리 조회된 스케줄
+#    oncall_rotation 이 바뀔 때마다 트리거가 올리는 버전과 함께 저장되며, 현재 버전과 같을 때만 사용한다.
+#    (supabase/migrations/20261017000300_oncall_list_cache_version.sql)
+CACHE_TTL = float(os.environ.get("ONCALL_CACHE_TTL", "10"))
+response_cache = {}
+
+# DB에 get_oncall_list_cache / store_oncall_list_cache 함수가 없으면 Supabase 캐시 없이 매번 조회
+use_cache_rpc = os.environ.get("ONCALL_CACHE_RPC", "1") != "0"
 
 def get_kst_now():
     """현재 한국 시간을 반환"""
-    kst = pytz.timezone('Asia/Seoul')
-    return datetime.now(kst)
+    return datetime.now(KST)
 
 def format_date(date):
     """날짜를 YYYY-MM-DD 형식으로 변환"""
     return date.strftime("%Y-%m-%d")
 
-def get_oncall_schedule():
-    """오늘부터 한 달 이내의 온콜 스케줄 조회"""
+def fetch_oncall_schedule():
+    """오늘부터 한 달 이내의 온콜 스케줄 조회 (오류는 호출자에게 전달)"""
     today = get_kst_now()
     end_date = today + timedelta(days=30)
 
+    response = get_supabase().table('oncall_rotation') \
+        .select('*') \
+        .gte('date', format_date(today)) \
+        .lte('date', format_date(end_date)) \
+        .order('date') \
+        .execute()
+    return response.data or []
+
+def store_cached_schedule(cache_key, version, schedule):
+    """조회 전에 읽은 버전이 아직 현재 버전일 때만 저장 (그 사이 교체가 있었으면 저장하지 않음)"""
     try:
-        response = supabase.table('oncall_rotation') \
-            .select('*') \
-            .gte('date', format_date(today)) \
-            .lte('date', format_date(end_date)) \
-            .order('date') \
-            .execute()
-
-        if response.data:
-            return response.data
-        return []
+        get_supabase().rpc('store_oncall_list_cache', {
+            'p_cache_key': cache_key,
+            'p_version': version,
+            'p_payload': schedule
+        }).execute()
+    except Exception as e:
+        print(f"Error storing cached schedule: {e}")
+
+def load_schedule(cache_key):
+    """현재 버전의 Supabase 캐시 행 → 없으면 스케줄 조회 후 저장"""
+    global use_cache_rpc
+    if use_cache_rpc:
+        try:
+            cached = get_supabase().rpc('get_oncall_list_cache', {'p_cache_key': cache_key}).execute().data
+        except Exception as e:
+            # PGRST202: 함수가 없음 → 캐시 없이 조회
+            if getattr(e, 'code', None) != 'PGRST202':
+                raise
+            print("get_oncall_list_cache RPC not found, reading oncall_rotation directly")
+            use_cache_rpc = False
+        else:
+            if cached and cached.get('payload') is not None:
+                return cached['payload']
+            # 버전을 스케줄보다 먼저 읽었으므로, 조회 도중 교체가 있었다면 이 버전으로는 저장되지 않는다
+            schedule = fetch_oncall_schedule()
+            if cached:
+                store_cached_schedule(cache_key, cached['version'], schedule)
+            return schedule
+    return fetch_oncall_schedule()
+
+def get_oncall_response():
+    """/온콜리스트 응답 (스케줄은 KST 날짜별 캐시)
+
+    메모리 캐시 → Supabase 캐시 행 → 스케줄 조회 순으로 찾는다.
+    Supabase 조회가 실패하거나 타임아웃되면 같은 날짜의 만료된 메모리 캐시라도 사용한다.
+    """
+    cache_key = format_date(get_kst_now())
+    now = time.monotonic()
+    cached = response_cache.get(cache_key)
+    if cached and cached[0] > now:
+        return format_slack_message(cached[1])
+
+    try:
+        schedule = load_schedule(cache_key)
     except Exception as e:
         print(f"Error getting schedule from Supabase: {e}")
-        return []
+        return format_slack_message(cached[1] if cached else [])
+
+    response_cache.clear()
+    response_cache[cache_key] = (now + CACHE_TTL, schedule)
+    return format_slack_message(schedule)
 
 def format_slack_message(schedule_data):
     """Slack 메시지 포맷으로 변환"""
@@ -74,12 +145,10 @@ def format_slack_message(schedule_data):
         6: '일'
     }
 
-    kst = pytz.timezone('Asia/Seoul')
-
     for item in schedule_data:
         # YYYY-MM-DD 형식의 날짜를 파싱 (KST 기준)
         date_obj = datetime.strptime(item['date'], '%Y-%m-%d')
-        date_obj = kst.localize(date_obj)
+        date_obj = date_obj.replace(tzinfo=KST)
 
         weekday = date_obj.weekday()
         weekday_str = weekday_map[weekday]
@@ -136,11 +205,8 @@ class handler(BaseHTTPRequestHandler):
     def do_POST(self):
         """POST 요청 처리 (Slack slash command)"""
         try:
-            # 온콜 스케줄 조회
-            schedule = get_oncall_schedule()
-
-            # Slack 메시지 포맷으로 변환
-            slack_response = format_slack_message(schedule)
+            # 온콜 스케줄 조회 및 Slack 메시지 포맷으로 변환 (캐시)
+            slack_response = get_oncall_response()
 
             # 응답 전송
             self.send_response(200)
@@ -1,24 +1,53 @@
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import parse_qs
-from supabase import create_client
-import pytz
-import requests
-from concurrent.futures import ThreadPoolExecutor
-import time
-
-# Supabase 클라이언트 초기화
-supabase = create_client(
-    os.environ.get("SUPABASE_URL", ""),
-    os.environ.get("SUPABASE_KEY", "")
-)
+from zoneinfo import ZoneInfo
+
+KST = ZoneInfo('Asia/Seoul')
+
+# Supabase가 느려도 Slack 3초 제한 안에 끝나도록 DB 요청 타임아웃을 짧게 둠
+DB_TIMEOUT = float(os.environ.get("ONCALL_DB_TIMEOUT", "2"))
+
+# 교체 결과를 이 시간(초) 안에 얻으면 HTTP 응답으로 바로 반환하고,
+# 넘으면 ack 를 먼저 보낸 뒤 같은 요청 처리 안에서 결과를 response_url 로 전송
+ACK_DEADLINE = float(os.environ.get("ONCALL_SWAP_ACK_DEADLINE", "2.5"))
+
+# Supabase 클라이언트 (첫 DB 요청 때 생성, GET 헬스체크와 사용법 오류 응답은 supabase를 import하지 않음)
+supabase = None
+
+def get_supabase():
+    global supabase
+    if supabase is None:
+        from supabase import create_client, ClientOptions
+        supabase = create_client(
+            os.environ.get("SUPABASE_URL", ""),
+            os.environ.get("SUPABASE_KEY", ""),
+            options=ClientOptions(postgrest_client_timeout=DB_TIMEOUT)
+        )
+    return supabase
+
+# 교체 작업용 워커 (ACK_DEADLINE 을 넘기면 요청 스레드는 ack 를 먼저 보냄)
+swap_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("ONCALL_SWAP_WORKERS", "16")))
+
+# response_url 전송용 keep-alive 세션 (warm 인스턴스에서 재사용, 첫 전송 때 생성)
+http_session = None
+
+def get_http_session():
+    global http_session
+    if http_session is None:
+        import requests
+        http_session = requests.Session()
+    return http_session
+
+# DB에 swap_oncall 함수가 없으면 (로컬 테스트 DB 등) 여러 단계로 나눠 처리하는 fallback 사용
+use_swap_rpc = os.environ.get("ONCALL_SWAP_RPC", "1") != "0"
 
 def get_kst_now():
     """현재 한국 시간을 반환"""
-    kst = pytz.timezone('Asia/Seoul')
-    return datetime.now(kst)
+    return datetime.now(KST)
 
 def format_date(date):
     """날짜를 YYYY-MM-DD 형식으로 변환"""
@@ -41,23 +70,28 @@ def parse_command_text(text):
 
     return members
 
-def get_nearest_future_schedule(member_name, today_str):
-    """특정 멤버의 오늘 이후 가장 가까운 온콜 스케줄 조회"""
+def get_nearest_future_schedules(member_names, today_str):
+    """여러 멤버의 오늘 이후 가장 가까운 온콜 스케줄을 한 번의 쿼리로 조회
+
+    반환: {멤버 이름: 스케줄} (향후 스케줄이 없는 멤버는 포함되지 않음)
+    """
     try:
-        response = supabase.table('oncall_rotation') \
+        response = get_supabase().table('oncall_rotation') \
             .select('*') \
-            .eq('member', member_name) \
+            .in_('member', list(member_names)) \
             .gte('date', today_str) \
             .order('date') \
-            .limit(1) \
+            .order('id') \
             .execute()
 
-        if response.data and len(response.data) > 0:
-            return response.data[0]
-        return None
+        # 날짜순(같은 날짜면 id순)으로 정렬되어 있으므로 멤버별 첫 번째 행이 가장 가까운 스케줄
+        nearest = {}
+        for row in response.data or []:
+            nearest.setdefault(row['member'], row)
+        return nearest
     except Exception as e:
-        print(f"Error getting schedule for {member_name}: {e}")
-        return None
+        print(f"Error getting schedules for {member_names}: {e}")
+        return {}
 
 def swap_schedules(original_schedule1, original_schedule2):
     """두 스케줄의 담당자를 서로 바꿈"""
@@ -72,7 +106,7 @@ def swap_schedules(original_schedule1, original_schedule2):
 
         # 첫 번째 스케줄 업데이트: schedule1에 member2 할당
         # count='exact'를 사용하여 업데이트된 행 수 확인
-        result1 = supabase.table('oncall_rotation') \
+        result1 = get_supabase().table('oncall_rotation') \
             .update({'member': member2}, count='exact') \
             .eq('id', original_schedule1['id']) \
             .execute()
@@ -82,7 +116,7 @@ def swap_schedules(original_schedule1, original_schedule2):
         sys.stderr.flush()
 
         # 두 번째 스케줄 업데이트: schedule2에 member1 할당
-        result2 = supabase.table('oncall_rotation') \
+        result2 = get_supabase().table('oncall_rotation') \
             .update({'member': member1}, count='exact') \
             .eq('id', original_schedule2['id']) \
             .execute()
@@ -105,6 +139,42 @@ def swap_schedules(original_schedule1, original_schedule2):
         sys.stderr.flush()
         return False
 
+def swap_nearest_schedules(member1, member2, today_str):
+    """두 멤버의 오늘 이후 가장 가까운 스케줄을 찾아 담당자를 서로 바꿈
+
+    swap_oncall 함수(supabase/migrations 참고)가 있으면 한 번의 RPC로 조회와 교체를
+    하나의 트랜잭션에서 처리하고, 없으면 조회 1번 + update 2번으로 처리한다.
+    반환: {'schedule1': dict | None, 'schedule2': dict | None, 'swapped': bool}
+    (schedule은 교체 전 원본)
+    """
+    global use_swap_rpc
+    if use_swap_rpc:
+        try:
+            response = get_supabase().rpc('swap_oncall', {
+                'p_member1': member1,
+                'p_member2': member2,
+                'p_from': today_str
+            }).execute()
+            return response.data
+        except Exception as e:
+            # PGRST202: 함수가 없음 → fallback
+            if getattr(e, 'code', None) != 'PGRST202':
+                raise
+            print("swap_oncall RPC not found, falling back to multi-step swap")
+            use_swap_rpc = False
+
+    nearest = get_nearest_future_schedules([member1, member2], today_str)
+    schedule1 = nearest.get(member1)
+    schedule2 = nearest.get(member2)
+    if not schedule1 or not schedule2:
+        return {'schedule1': schedule1, 'schedule2': schedule2, 'swapped': False}
+
+    return {
+        'schedule1': schedule1,
+        'schedule2': schedule2,
+        'swapped': swap_schedules(schedule1, schedule2)
+    }
+
 def format_slack_response(success, member1, member2, schedule1, schedule2, error_msg=None):
     """Slack 응답 메시지 포맷"""
     if not success:
@@ -124,15 +194,13 @@ def format_slack_response(success, member1, member2, schedule1, schedule2, error
         6: '일'
     }
 
-    kst = pytz.timezone('Asia/Seoul')
-
     # 날짜 파싱 및 요일 계산
     date1_obj = datetime.strptime(schedule1['date'], '%Y-%m-%d')
-    date1_obj = kst.localize(date1_obj)
+    date1_obj = date1_obj.replace(tzinfo=KST)
     weekday1 = weekday_map[date1_obj.weekday()]
 
     date2_obj = datetime.strptime(schedule2['date'], '%Y-%m-%d')
-    date2_obj = kst.localize(date2_obj)
+    date2_obj = date2_obj.replace(tzinfo=KST)
     weekday2 = weekday_map[date2_obj.weekday()]
 
     # Block Kit 형식으로 메시지 구성
@@ -188,22 +256,21 @@ def format_slack_response(success, member1, member2, schedule1, schedule2, error
         'blocks': blocks
     }
 
-def send_delayed_response(response_url, member1, member2, today_str):
-    """
-    짧은 지연 후 실제 처리를 수행하고 response_url로 결과 전송
-    이 함수는 즉시 반환되고, 내부에서 별도로 처리
+def build_swap_response(member1, member2, today_str):
+    """두 멤버의 가장 가까운 스케줄을 교체하고 슬랙 응답 메시지를 반환
+
+    보통은 swap_oncall RPC 한 번이라 핸들러가 결과를 HTTP 응답 본문으로 바로 돌려주고,
+    ACK_DEADLINE 을 넘기면 ack 후 response_url 로 보낸다. 예외는 던지지 않고 오류 메시지로 반환한다.
     """
     import sys
     try:
-        # 약간의 지연을 주어 메인 응답이 먼저 전송되도록 함
-        time.sleep(3.1)
-
         sys.stderr.write(f"[DEBUG] Starting swap process for {member1} and {member2}\n")
         sys.stderr.flush()
 
-        # 각 멤버의 가장 가까운 미래 스케줄 조회
-        schedule1 = get_nearest_future_schedule(member1, today_str)
-        schedule2 = get_nearest_future_schedule(member2, today_str)
+        # 각 멤버의 가장 가까운 미래 스케줄 조회 + 교체 (가능하면 한 번의 RPC로)
+        swap_result = swap_nearest_schedules(member1, member2, today_str)
+        schedule1 = swap_result['schedule1']
+        schedule2 = swap_result['schedule2']
 
         sys.stderr.write(f"[DEBUG] Found schedule1: {schedule1}\n")
         sys.stderr.write(f"[DEBUG] Found schedule2: {schedule2}\n")
@@ -211,26 +278,18 @@ def send_delayed_response(response_url, member1, member2, today_str):
 
         # 스케줄 존재 여부 확인
         if not schedule1:
-            error_response = format_slack_response(
+            print(f"Schedule not found for {member1}, sending error response")
+            return format_slack_response(
                 False, member1, member2, None, None,
                 f"'{member1}'의 향후 온콜 일정을 찾을 수 없습니다."
             )
-            print(f"Schedule not found for {member1}, sending error response")
-            print(f"Error payload: {json.dumps(error_response, ensure_ascii=False)}")
-            result = requests.post(response_url, json=error_response, timeout=10)
-            print(f"Error response sent, status code: {result.status_code}, body: {result.text}")
-            return
 
         if not schedule2:
-            error_response = format_slack_response(
+            print(f"Schedule not found for {member2}, sending error response")
+            return format_slack_response(
                 False, member1, member2, None, None,
                 f"'{member2}'의 향후 온콜 일정을 찾을 수 없습니다."
             )
-            print(f"Schedule not found for {member2}, sending error response")
-            print(f"Error payload: {json.dumps(error_response, ensure_ascii=False)}")
-            result = requests.post(response_url, json=error_response, timeout=10)
-            print(f"Error response sent, status code: {result.status_code}, body: {result.text}")
-            return
 
         # 원본 스케줄 정보 저장 (응답 메시지용)
         original_schedule1 = {
@@ -246,46 +305,48 @@ def send_delayed_response(response_url, member1, member2, today_str):
 
         print(f"Found schedules - {member1}: {schedule1['date']}, {member2}: {schedule2['date']}")
 
-        # 스케줄 교체
-        success = swap_schedules(schedule1, schedule2)
+        success = swap_result['swapped']
         print(f"Swap result: {success}")
 
-        # 응답 생성
-        slack_response = format_slack_response(
+        return format_slack_response(
             success, member1, member2,
             original_schedule1, original_schedule2,
             "데이터베이스 업데이트 중 오류가 발생했습니다." if not success else None
         )
 
-        # response_url로 결과 전송
-        sys.stderr.write(f"[DEBUG] About to send result to response_url\n")
-        sys.stderr.flush()
-
-        result = requests.post(response_url, json=slack_response, timeout=10)
-
-        sys.stderr.write(f"[DEBUG] Response sent, status: {result.status_code}\n")
-        sys.stderr.write(f"[DEBUG] Response body: {result.text}\n")
-        sys.stderr.flush()
-
     except Exception as e:
-        import sys
-        sys.stderr.write(f"[ERROR] Exception in background processing: {e}\n")
+        sys.stderr.write(f"[ERROR] Exception while swapping: {e}\n")
         import traceback
         traceback.print_exc(file=sys.stderr)
         sys.stderr.flush()
 
-        error_response = {
+        if is_timeout(e):
+            # 요청은 타임아웃됐지만 DB 에서는 교체가 끝났을 수 있음
+            return {
+                'response_type': 'in_channel',
+                'text': '⏱️ 데이터베이스 응답이 늦어 교체 결과를 확인하지 못했습니다.\n'
+                        '/온콜리스트 로 일정을 확인한 뒤, 바뀌지 않았으면 다시 시도해 주세요.'
+            }
+        return {
             'response_type': 'in_channel',
             'text': f'⚠️ 오류가 발생했습니다: {str(e)}'
         }
 
-        try:
-            result = requests.post(response_url, json=error_response, timeout=10)
-            sys.stderr.write(f"[DEBUG] Error response sent, status: {result.status_code}\n")
-            sys.stderr.flush()
-        except Exception as req_error:
-            sys.stderr.write(f"[ERROR] Failed to send error response: {req_error}\n")
-            sys.stderr.flush()
+def is_timeout(error):
+    """DB 요청 타임아웃(httpx.TimeoutException 등)인지 확인"""
+    return isinstance(error, TimeoutError) or 'Timeout' in type(error).__name__
+
+def send_delayed_response(response_url, payload):
+    """ack 이후 교체 결과를 response_url 로 전송"""
+    import sys
+    if not response_url:
+        sys.stderr.write("[ERROR] No response_url, swap result was not delivered\n")
+        return
+    try:
+        result = get_http_session().post(response_url, json=payload, timeout=10)
+        print(f"Delayed response sent, status code: {result.status_code}")
+    except Exception as e:
+        sys.stderr.write(f"[ERROR] Failed to send delayed response: {e}\n")
 
 class handler(BaseHTTPRequestHandler):
     """Vercel Serverless Function 핸들러"""
@@ -303,9 +364,17 @@ class handler(BaseHTTPRequestHandler):
 
         self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
 
+    def send_json(self, payload):
+        """JSON 응답을 Content-Length와 함께 전송"""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def do_POST(self):
         """POST 요청 처리 (Slack slash command)"""
-        executor = None
         try:
             # POST 데이터 읽기
             content_length = int(self.headers.get('Content-Length', 0))
@@ -317,11 +386,10 @@ class handler(BaseHTTPRequestHandler):
             # 명령어 텍스트 추출 (예: "엔도 로쿤")
             command_text = params.get('text', [''])[0]
 
-            # response_url 추출 (백그라운드 작업 결과를 보낼 URL)
+            # response_url 추출 (ACK_DEADLINE 을 넘겼을 때 결과를 보낼 URL)
             response_url = params.get('response_url', [''])[0]
 
             print(f"Received command: {command_text}")
-            print(f"Response URL: {response_url}")
 
             # 멤버 이름 파싱
             members = parse_command_text(command_text)
@@ -331,10 +399,7 @@ class handler(BaseHTTPRequestHandler):
                     False, None, None, None, None,
                     "사용법: /온콜바꿔 [멤버1] [멤버2]\n예: /온콜바꿔 엔도 로쿤"
                 )
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(error_response, ensure_ascii=False).encode('utf-8'))
+                self.send_json(error_response)
                 return
 
             member1, member2 = members
@@ -343,36 +408,24 @@ class handler(BaseHTTPRequestHandler):
             today = get_kst_now()
             today_str = format_date(today)
 
-            # 즉시 200 응답 반환 (Slack 3초 타임아웃 방지)
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-
-            immediate_response = {
-                'response_type': 'in_channel',
-                'text': f'⏳ {member1}와 {member2}의 온콜 일정을 변경하고 있습니다...'
-            }
-            self.wfile.write(json.dumps(immediate_response, ensure_ascii=False).encode('utf-8'))
-
-            print(f"Immediate response sent")
-
-            # 응답 후 ThreadPoolExecutor를 사용하여 백그라운드 작업 시작
-            executor = ThreadPoolExecutor(max_workers=1)
-            future = executor.submit(send_delayed_response, response_url, member1, member2, today_str)
-
-            print(f"Background task submitted")
-
-            # future가 완료될 때까지 기다림 (최대 15초)
-            # 이렇게 하면 serverless function이 종료되기 전에 작업이 완료됨
+            # 보통은 RPC 한 번이라 Slack 3초 제한 안에 끝나므로 결과를 바로 in_channel 응답으로 반환
+            future = swap_executor.submit(build_swap_response, member1, member2, today_str)
             try:
-                future.result(timeout=15)
-                print(f"Background task completed successfully")
-            except TimeoutError:
-                print(f"Background task timed out after 15 seconds")
-            except Exception as e:
-                print(f"Background task error: {e}")
-                import traceback
-                traceback.print_exc()
+                self.send_json(future.result(timeout=ACK_DEADLINE))
+                print(f"Swap response sent")
+                return
+            except FutureTimeout:
+                pass
+
+            # 늦어지면 ack 를 먼저 보내고, 이 요청 처리 안에서 결과를 기다려 response_url 로 전송
+            # (핸들러가 끝날 때까지 함수 실행이 유지되도록 백그라운드로 넘기지 않음)
+            self.send_json({
+                'response_type': 'ephemeral',
+                'text': f'⏳ {member1}와 {member2}의 온콜 일정을 변경하고 있습니다. 결과는 곧 이 채널에 올라옵니다.'
+            })
+            self.wfile.flush()
+            print(f"Swap ack sent, waiting for result")
+            send_delayed_response(response_url, future.result())
 
         except Exception as e:
             print(f"Error in handler: {e}")
@@ -390,8 +443,3 @@ class handler(BaseHTTPRequestHandler):
             }
 
             self.wfile.write(json.dumps(error_response, ensure_ascii=False).encode('utf-8'))
-
-        finally:
-            # Executor 정리
-            if executor:
-                executor.shutdown(wait=False)
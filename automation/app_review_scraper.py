@@ -1,13 +1,64 @@
 from dotenv import load_dotenv
 from google_play_scraper import reviews, Sort
-from supabase import create_client
-import json
+from concurrency import HostLimiter, run_tasks
+from cursor_store import get_cursor, set_cursor
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from slack_queue import SlackQueue, format_stats, section
+import outbox
+import argparse
+import asyncio
+import http_cache
 import os
-import requests
+import re
+import time
+import transport
 import xml.etree.ElementTree as ET
 
 load_dotenv(".env")
 
+# backfill 모드: Google Play 한 페이지당 리뷰 수 / 최대 페이지 수 (안전장치)
+BACKFILL_PAGE_SIZE = int(os.getenv("APP_REVIEW_BACKFILL_PAGE_SIZE", "100"))
+BACKFILL_MAX_PAGES = int(os.getenv("APP_REVIEW_BACKFILL_MAX_PAGES", "50"))
+# 중간 페이지가 빈 결과(token 없음)로 돌아온 실행이 이 횟수만큼 이어지면 피드의 끝으로 봄
+BACKFILL_EMPTY_RETRIES = int(os.getenv("APP_REVIEW_BACKFILL_EMPTY_RETRIES", "3"))
+
+# App Store RSS 호스트 (리플레이 벤치마크에서 로컬 서버로 교체)
+APP_STORE_RSS_BASE_URL = os.getenv("APP_STORE_RSS_BASE_URL", "https://itunes.apple.com")
+
+# App Store RSS 페이지 수 (피드는 최대 10페이지) / 앱당 동시 페이지 요청 수
+APP_STORE_MAX_PAGES = int(os.getenv("APP_STORE_MAX_PAGES", "10"))
+APP_STORE_PAGE_CONCURRENCY = int(os.getenv("APP_STORE_PAGE_CONCURRENCY", "4"))
+
+# RSS 스트리밍 파싱 시 한 번에 읽을 바이트 수
+RSS_CHUNK_SIZE = 16 * 1024
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+IM_NS = '{http://itunes.apple.com/rss}'
+RSS_ENTRY_ID = re.compile(r'<entry\b.*?<id\b[^>]*>([^<]*)</id>', re.S)
+
+# 앱/스토어 작업을 동시에 실행할 워커 수
+MAX_WORKERS = int(os.getenv("APP_REVIEW_MAX_WORKERS", "12"))
+
+# 원격 호스트별 동시 요청 수 제한
+PLAY_STORE_CONCURRENCY = int(os.getenv("PLAY_STORE_CONCURRENCY", "4"))
+APP_STORE_CONCURRENCY = int(os.getenv("APP_STORE_CONCURRENCY", "4"))
+SUPABASE_CONCURRENCY = int(os.getenv("SUPABASE_CONCURRENCY", "6"))
+HOST_LIMITER = HostLimiter({
+    "play.google.com": PLAY_STORE_CONCURRENCY,
+    "itunes.apple.com": APP_STORE_CONCURRENCY,
+    "supabase": SUPABASE_CONCURRENCY,
+})
+
+PLATFORM_LABELS = {"google_play": "Google Play", "app_store": "App Store"}
+
+# in_ 조회 한 번에 넣을 리뷰 ID 개수 (PostgREST URL 길이 제한 대비)
+EXISTS_CHUNK_SIZE = 100
+
+# 리뷰 테이블의 unique 제약 (supabase/migrations 의 review_unique 마이그레이션)
+REVIEW_CONFLICT_KEY = "platform_review_id,platform_type"
+
 APPS = {
     "plab": {
         "app_name": "플랩풋볼",
@@ -67,29 +118,121 @@ class AppReviewScraper:
         self.google_package_name = google_package_name
         self.apple_app_id = apple_app_id
         self.count = count
-        
-        self.supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_KEY")
-        )
 
-    def review_exists(self, review_id, platform_type):
-        result = self.supabase.table(self.table_name) \
-            .select('platform_review_id') \
-            .eq('platform_review_id', review_id) \
-            .eq('platform_type', platform_type) \
-            .execute()
-        return len(result.data) > 0
+        self.supabase = transport.get_supabase()
+        self.slack_queue = SlackQueue()
+
+    def existing_review_ids(self, review_ids, platform_type):
+        """이미 저장된 리뷰 ID 집합을 반환 (청크 단위 in_ 조회로 한 번에 확인)"""
+        ids = list(dict.fromkeys(review_ids))
+        existing = set()
+        for i in range(0, len(ids), EXISTS_CHUNK_SIZE):
+            chunk = ids[i:i + EXISTS_CHUNK_SIZE]
+            with HOST_LIMITER.slot("supabase"):
+                result = self.supabase.table(self.table_name) \
+                    .select('platform_review_id') \
+                    .eq('platform_type', platform_type) \
+                    .in_('platform_review_id', chunk) \
+                    .execute()
+            existing.update(str(row['platform_review_id']) for row in result.data)
+        return existing
 
-    def save_review_to_supabase(self, review_id, platform, user, rating, review, created_at):
-        self.supabase.table(self.table_name).insert({
+    def build_review_row(self, review_id, platform, user, rating, review, created_at):
+        return {
             'platform_type': platform,
             'user_name': user,
             'rating': rating,
             'review': review,
             'created_at': created_at,
-            'platform_review_id': review_id
-        }).execute()
+            'platform_review_id': review_id,
+            'notified': False,
+            'notify_attempts': 0
+        }
+
+    def cursor_key(self, platform_type):
+        return f"app_review:{self.table_name}:{platform_type}"
+
+    def reached_cursor(self, row, cursor, since=None):
+        """row가 커서(마지막으로 본 리뷰) 또는 since 날짜 이전인지 확인
+
+        App Store 의 updated 는 태평양 시간 오프셋(-07:00 / -08:00)이 붙어 있어 문자열로 비교하면
+        서머타임 전환 전후의 순서가 뒤바뀌므로 시각으로 바꿔 비교한다.
+        """
+        created_at = parse_timestamp(row['created_at'])
+        if cursor:
+            if row['platform_review_id'] == cursor.get('review_id'):
+                return True
+            cursor_at = parse_timestamp(cursor.get('created_at'))
+            if created_at and cursor_at and created_at < cursor_at:
+                return True
+        since_at = parse_timestamp(since)
+        return bool(created_at and since_at and created_at < since_at)
+
+    def select_new_reviews(self, candidates, platform_type, cursor, since=None):
+        """최신순 후보 중 커서(마지막으로 본 리뷰)나 since 날짜에 도달하기 전까지만 남기고, DB에 없는 리뷰를 골라냄
+
+        반환값: (커서 이후 후보 목록, 새로 저장할 리뷰 목록)
+        """
+        recent = []
+        for row in candidates:
+            if self.reached_cursor(row, cursor, since):
+                break
+            recent.append(row)
+
+        existing = self.existing_review_ids([row['platform_review_id'] for row in recent], platform_type)
+        rows = []
+        for row in recent:
+            if row['platform_review_id'] in existing:
+                continue
+            existing.add(row['platform_review_id'])
+            rows.append(row)
+        return recent, rows
+
+    def newest_position(self, recent):
+        if not recent:
+            return None
+        newest = max(recent, key=lambda row: parse_timestamp(row['created_at']) or OLDEST)
+        return {
+            'review_id': newest['platform_review_id'],
+            'created_at': newest['created_at']
+        }
+
+    def advance_cursor(self, platform_type, recent):
+        """이번 실행에서 본 가장 최신 리뷰를 커서로 저장"""
+        position = self.newest_position(recent)
+        if position:
+            set_cursor(self.cursor_key(platform_type), position)
+
+    def upsert_reviews(self, rows):
+        """이미 저장된 리뷰(platform_review_id, platform_type)는 건너뛰고 저장"""
+        with HOST_LIMITER.slot("supabase"):
+            self.supabase.table(self.table_name).upsert(
+                rows, on_conflict=REVIEW_CONFLICT_KEY, ignore_duplicates=True
+            ).execute()
+
+    def save_reviews_to_supabase(self, rows):
+        """새 리뷰들을 한 번의 bulk upsert로 저장
+
+        한 요청 안에서는 전부 저장되거나 전부 실패하므로, 실패하면 한 건씩 다시 저장해
+        문제가 있는 리뷰만 건너뛴다. 반환값: 저장하지 못한 리뷰 수
+        (0 이 아니면 호출자는 커서를 전진시키지 않아 다음 실행에서 다시 저장한다)
+        """
+        if not rows:
+            return 0
+        try:
+            self.upsert_reviews(rows)
+            return 0
+        except Exception as e:
+            print(f"⚠️ {self.app_name} 리뷰 {len(rows)}건 일괄 저장 실패, 한 건씩 다시 저장합니다: {e}")
+
+        failed = 0
+        for row in rows:
+            try:
+                self.upsert_reviews([row])
+            except Exception as e:
+                failed += 1
+                print(f"❌ {self.app_name} 리뷰 저장 실패 ({row['platform_type']} {row['platform_review_id']}): {e}")
+        return failed
 
     def get_star_rating(self, rating):
         try:
@@ -98,76 +241,401 @@ class AppReviewScraper:
         except Exception:
             return ""
 
-    def send_to_slack(self, platform, name, rating, content, created_at):
+    def slack_notification(self, row):
+        """outbox 의 리뷰 행 → (webhook, blocks, text)"""
+        platform = PLATFORM_LABELS.get(row['platform_type'], row['platform_type'])
+        rating = row['rating']
         stars = self.get_star_rating(rating)
-        created_line = f"\n🕒 작성일: {created_at}" if created_at else ""
+        created_line = f"\n🕒 작성일: {row['created_at']}" if row.get('created_at') else ""
         msg = (
             f"📱 *{platform} 리뷰 도착!*\n"
-            f"🧚‍♀️ 이름: {name}\n"
+            f"🧚‍♀️ 이름: {row['user_name']}\n"
             f"⭐️ 평점: {stars} (*{rating}점*)\n"
-            f"💬 내용: {content}\n"
+            f"💬 내용: {row['review']}\n"
             f"{created_line}"
         )
-        headers = {'Content-Type': 'application/json; charset=utf-8'}
-        requests.post(self.slack_webhook_url, data=json.dumps({"text": msg}), headers=headers)
+        return self.slack_webhook_url, [section(msg), {"type": "divider"}], f"{self.app_name} {platform} 리뷰 도착"
+
+    def drain_notifications(self):
+        """notified=false 로 저장된 리뷰를 묶어서 슬랙으로 보내고 notified=true 로 표시"""
+        result = outbox.drain(self.table_name, self.slack_notification, queue=self.slack_queue)
+        if result['items']:
+            print(f"{self.app_name} {format_stats(result)}")
+        return result
+
+    def fetch_google_play(self):
+        return reviews(self.google_package_name, lang='ko', country='kr', count=self.count, sort=Sort.NEWEST)
+
+    def store_google_play(self, new_reviews):
+        """가져온 리뷰 중 커서 이후의 새 리뷰만 저장하고 커서를 전진 (저장에 실패한 리뷰가 있으면 커서 유지)"""
+        candidates = self.google_play_rows(new_reviews)
+        recent, rows = self.select_new_reviews(candidates, "google_play", get_cursor(self.cursor_key("google_play")))
+
+        if self.save_reviews_to_supabase(rows):
+            print(f"⚠️ {self.app_name} Google Play 리뷰 저장 실패: 커서를 유지합니다.")
+            return
+        self.advance_cursor("google_play", recent)
 
     def process_google_play(self):
-        new_reviews, _ = reviews(self.google_package_name, lang='ko', country='kr', count=self.count, sort=Sort.NEWEST)
-        for r in new_reviews:
-            review_id = r['reviewId']
-            if self.review_exists(review_id, "google_play"):
+        with HOST_LIMITER.slot("play.google.com"):
+            new_reviews, _ = self.fetch_google_play()
+        self.store_google_play(new_reviews)
+
+    async def process_google_play_async(self, engine):
+        """process_google_play 의 AsyncEngine 버전 (google_play_scraper 는 동기라 executor 에서 실행)"""
+        new_reviews, _ = await engine.run_sync(self.fetch_google_play, host="play.google.com")
+        await engine.run_sync(self.store_google_play, new_reviews)
+
+    def google_play_rows(self, new_reviews):
+        return [
+            self.build_review_row(r['reviewId'], "google_play", r['userName'], r['score'], r['content'], r['at'].isoformat())
+            for r in new_reviews
+        ]
+
+    def backfill_google_play(self, since=None, page_size=BACKFILL_PAGE_SIZE, max_pages=BACKFILL_MAX_PAGES):
+        """continuation token을 따라가며 커서(또는 since 날짜)에 도달할 때까지 Google Play 리뷰를 수집
+
+        페이지마다 바로 dedup → bulk insert → 슬랙 전송을 수행하고, 진행 상태(token)를
+        커서 저장소에 기록해 중간에 중단되어도 다음 실행에서 이어서 진행한다.
+        메인 커서는 backfill이 끝까지 완료된 뒤에만 전진시킨다.
+        """
+        key = self.cursor_key("google_play")
+        progress_key = f"{key}:backfill"
+        progress = get_cursor(progress_key)
+
+        if progress:
+            print(f"↩️ {self.app_name} backfill 재개 (since={progress.get('since')})")
+            stop = progress.get('stop')
+            newest = progress.get('newest')
+            since = progress.get('since')
+            token = restore_continuation_token(progress['token'], page_size)
+            empty_runs = progress.get('empty', 0)
+        else:
+            stop = get_cursor(key)
+            newest = None
+            token = None
+            empty_runs = 0
+
+        for page in range(max_pages):
+            request_token = token
+            with HOST_LIMITER.slot("play.google.com"):
+                new_reviews, token = reviews(
+                    self.google_package_name, lang='ko', country='kr', count=page_size,
+                    sort=Sort.NEWEST, continuation_token=token
+                )
+
+            # reviews() 는 요청 오류도 ([], token 없음) 으로 돌려주므로, 이어받은 페이지가 비어 있으면
+            # 바로 끝으로 보지 않고 진행 상태를 남겨 다음 실행에서 같은 페이지를 다시 요청한다.
+            if request_token is not None and not new_reviews and not getattr(token, 'token', None):
+                empty_runs += 1
+                if empty_runs < BACKFILL_EMPTY_RETRIES:
+                    print(f"⚠️ {self.app_name} backfill page {page + 1}: 빈 응답, 다음 실행에서 다시 시도합니다.")
+                    set_cursor(progress_key, {'token': request_token.token, 'stop': stop, 'newest': newest,
+                                              'since': since, 'empty': empty_runs})
+                    return
+                print(f"ℹ️ {self.app_name} backfill page {page + 1}: {empty_runs}번 연속 빈 응답, 끝으로 봅니다.")
+            empty_runs = 0
+
+            candidates = self.google_play_rows(new_reviews)
+            recent, rows = self.select_new_reviews(candidates, "google_play", stop, since)
+
+            failed = self.save_reviews_to_supabase(rows)
+            self.drain_notifications()
+            if failed:
+                # 진행 상태(이 페이지의 token)와 메인 커서를 그대로 두고 다음 실행에서 이 페이지부터 다시 시도
+                print(f"⚠️ {self.app_name} backfill page {page + 1}: 리뷰 {failed}건 저장 실패, 진행 상태를 유지합니다.")
+                return
+
+            newest = newest or self.newest_position(recent)
+            print(f"📄 {self.app_name} backfill page {page + 1}: {len(candidates)}개 중 {len(rows)}개 저장")
+
+            reached_end = len(recent) < len(candidates) or not new_reviews or not getattr(token, 'token', None)
+            if reached_end:
+                break
+            set_cursor(progress_key, {'token': token.token, 'stop': stop, 'newest': newest, 'since': since})
+        else:
+            print(f"⚠️ {self.app_name} backfill이 최대 페이지 수({max_pages})에 도달했습니다.")
+
+        if newest:
+            set_cursor(key, newest)
+        set_cursor(progress_key, {})
+
+    def app_store_row(self, entry):
+        """RSS <entry> 요소를 리뷰 row로 변환 (평점이 없는 앱 설명 entry는 None)"""
+        rating = entry.findtext(f'{IM_NS}rating')
+        if rating is None:
+            return None
+        title = entry.findtext(f'{ATOM_NS}title') or ""
+        body = entry.findtext(f'{ATOM_NS}content') or ""
+        return self.build_review_row(
+            entry.findtext(f'{ATOM_NS}id'),
+            "app_store",
+            entry.findtext(f'{ATOM_NS}author/{ATOM_NS}name'),
+            int(rating),
+            f"{title}\n{body}".strip(),
+            entry.findtext(f'{ATOM_NS}updated')
+        )
+
+    def app_store_rss_url(self, page):
+        return f"{APP_STORE_RSS_BASE_URL}/kr/rss/customerreviews/page={page}/id={self.apple_app_id}/sortby=mostrecent/xml"
+
+    def app_store_rows(self, chunks, cursor=None):
+        """RSS 바이트 청크를 파싱해 리뷰 row 목록으로 변환 (커서에 닿으면 해당 row까지만)"""
+        rows = []
+        for entry in iter_feed_entries(chunks):
+            try:
+                row = self.app_store_row(entry)
+            except Exception as e:
+                print(f"⚠️ 리뷰 파싱 중 오류 발생: {e}")
+                continue
+            if row is None:
                 continue
-            created_at = r['at'].isoformat()
-            self.save_review_to_supabase(review_id, "google_play", r['userName'], r['score'], r['content'], created_at)
-            self.send_to_slack("Google Play", r['userName'], r['score'], r['content'], created_at)
+            rows.append(row)
+            if self.reached_cursor(row, cursor):
+                break
+        return rows
+
+    def fetch_app_store_page(self, page, cursor=None):
+        """App Store 고객 리뷰 RSS 한 페이지를 스트리밍 파싱해 리뷰 row 목록으로 변환
+
+        커서(이미 본 리뷰)에 닿으면 해당 row까지만 담고 나머지 본문은 내려받지 않는다.
+        """
+        with HOST_LIMITER.slot("itunes.apple.com"):
+            response = transport.get(self.app_store_rss_url(page), stream=True)
+            try:
+                response.raise_for_status()
+                return self.app_store_rows(response.iter_content(chunk_size=RSS_CHUNK_SIZE), cursor)
+            finally:
+                response.close()
+
+    def reached_page_end(self, page_rows, cursor):
+        """빈 페이지이거나 커서에 닿은 페이지면 이후 페이지는 볼 필요 없음
+
+        커서가 없으면(첫 실행, 커서 저장소 초기화) 페이지의 리뷰가 모두 이미 저장된 리뷰일 때 멈춘다.
+        """
+        if not page_rows:
+            return True
+        if cursor:
+            return any(self.reached_cursor(row, cursor) for row in page_rows)
+        review_ids = {row['platform_review_id'] for row in page_rows}
+        return review_ids <= self.existing_review_ids(review_ids, "app_store")
+
+    def store_app_store(self, candidates, cursor, complete=True):
+        """페이지별 후보를 합쳐 새 리뷰만 저장하고 커서를 전진
+
+        요청에 실패한 페이지가 있거나(complete=False) 저장에 실패한 리뷰가 있으면 커서는 그대로 둔다.
+        (다음 실행에서 같은 커서까지 다시 확인해 빠진 리뷰를 저장)
+        반환값: 커서까지 모두 처리했는지 여부
+        """
+        if not candidates:
+            print("ℹ️ 리뷰 항목이 없습니다.")
+            return complete
+
+        # 페이지 경계에서 겹친 리뷰 제거 (최신순 유지)
+        merged, seen = [], set()
+        for row in candidates:
+            if row['platform_review_id'] not in seen:
+                seen.add(row['platform_review_id'])
+                merged.append(row)
+        recent, rows = self.select_new_reviews(merged, "app_store", cursor)
+
+        if self.save_reviews_to_supabase(rows):
+            print(f"⚠️ {self.app_name} App Store 리뷰 저장 실패: 커서를 유지합니다.")
+            return False
+        if not complete:
+            print(f"⚠️ {self.app_name} App Store 일부 페이지 요청 실패: 커서를 유지합니다.")
+            return False
+        self.advance_cursor("app_store", recent)
+        return True
+
+    def first_app_store_rows(self, page, cursor):
+        """조건부 요청으로 받은 1페이지 → 리뷰 row 목록 (지난번에 처리한 피드와 같으면 None)"""
+        # 304 는 httpx(AsyncEngine) 에서 raise_for_status() 가 예외를 내므로 먼저 확인
+        if not page.changed:
+            print(f"ℹ️ {self.app_name} App Store 리뷰 피드 변경 없음 ({page.reason})")
+            return None
+        page.response.raise_for_status()
+        return self.app_store_rows([page.content], cursor)
 
     def process_app_store(self):
         if not self.apple_app_id:
             print(f"⚠️ App ID가 없어 RSS 호출을 건너뜁니다: {self.app_name}")
             return
 
-        rss_url = f"https://itunes.apple.com/kr/rss/customerreviews/page=1/id={self.apple_app_id}/sortby=mostrecent/xml"
+        cursor = get_cursor(self.cursor_key("app_store"))
 
-        try:
-            response = requests.get(rss_url)
-            response.raise_for_status()
-            root = ET.fromstring(response.content)
-        except Exception as e:
-            print(f"❌ RSS 리뷰 요청 실패: {e}")
+        # 1페이지는 조건부 요청: 지난번에 처리한 피드와 같으면 나머지 페이지 / DB 작업 없이 종료
+        with HOST_LIMITER.slot("itunes.apple.com"):
+            first = http_cache.get(self.app_store_rss_url(1), fragment=rss_entry_ids)
+        candidates = self.first_app_store_rows(first, cursor)
+        if candidates is None:
             return
 
-        ns = {'atom': 'http://www.w3.org/2005/Atom', 'im': 'http://itunes.apple.com/rss'}
-        entries = root.findall('atom:entry', ns)
+        # 2..N 페이지를 동시에 요청하고, 페이지 순서대로 보면서 이미 본 리뷰(커서)에 닿으면 나머지는 취소
+        # 요청에 실패한 페이지는 피드의 끝으로 보지 않고 다음 페이지를 계속 본다.
+        failed = False
+        if not self.reached_page_end(candidates, cursor):
+            with ThreadPoolExecutor(max_workers=max(1, APP_STORE_PAGE_CONCURRENCY)) as executor:
+                futures = [
+                    executor.submit(self.fetch_app_store_page, page, cursor)
+                    for page in range(2, APP_STORE_MAX_PAGES + 1)
+                ]
+                for index, future in enumerate(futures, 1):
+                    try:
+                        page_rows = future.result()
+                    except Exception as e:
+                        print(f"❌ RSS 리뷰 요청 실패 (page={index + 1}): {e}")
+                        failed = True
+                        continue
+                    candidates.extend(page_rows)
+                    if self.reached_page_end(page_rows, cursor):
+                        for pending in futures[index:]:
+                            pending.cancel()
+                        break
 
-        if not entries or len(entries) <= 1:
-            print("ℹ️ 리뷰 항목이 없습니다 (또는 첫 번째는 앱 메타 정보입니다).")
+        if self.store_app_store(candidates, cursor, complete=not failed):
+            http_cache.remember(first)
+
+    async def process_app_store_async(self, engine):
+        """process_app_store 의 AsyncEngine 버전 (페이지 동시 수는 engine 의 호스트 제한을 따름)"""
+        if not self.apple_app_id:
+            print(f"⚠️ App ID가 없어 RSS 호출을 건너뜁니다: {self.app_name}")
             return
 
-        for entry in entries[1:]:  # 첫 번째 entry는 앱 설명, 제외
-            try:
-                review_id = entry.find('atom:id', ns).text
-                user = entry.find('atom:author/atom:name', ns).text
-                rating = int(entry.find('im:rating', ns).text)
-                title = entry.find('atom:title', ns).text or ""
-                body = entry.find('atom:content', ns).text or ""
-                created_at = entry.find('atom:updated', ns).text
-                content = f"{title}\n{body}".strip()
-
-                if self.review_exists(review_id, "app_store"):
+        cursor = await engine.run_sync(get_cursor, self.cursor_key("app_store"))
+        first = await http_cache.get_async(engine, self.app_store_rss_url(1), fragment=rss_entry_ids)
+        candidates = self.first_app_store_rows(first, cursor)
+        if candidates is None:
+            return
+
+        async def fetch(page):
+            response = await engine.get(self.app_store_rss_url(page))
+            response.raise_for_status()
+            return self.app_store_rows([response.content], cursor)
+
+        failed = False
+        if not await engine.run_sync(self.reached_page_end, candidates, cursor):
+            tasks = [asyncio.ensure_future(fetch(page)) for page in range(2, APP_STORE_MAX_PAGES + 1)]
+            for index, task in enumerate(tasks, 1):
+                try:
+                    page_rows = await task
+                except Exception as e:
+                    print(f"❌ RSS 리뷰 요청 실패 (page={index + 1}): {e}")
+                    failed = True
                     continue
+                candidates.extend(page_rows)
+                if await engine.run_sync(self.reached_page_end, page_rows, cursor):
+                    for pending in tasks[index:]:
+                        pending.cancel()
+                    break
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-                self.save_review_to_supabase(review_id, "app_store", user, rating, content, created_at)
-                self.send_to_slack("App Store", user, rating, content, created_at)
-            except Exception as e:
-                print(f"⚠️ 리뷰 파싱 중 오류 발생: {e}")
+        if await engine.run_sync(self.store_app_store, candidates, cursor, not failed):
+            await engine.run_sync(http_cache.remember, first)
 
     def run(self):
         self.process_google_play()
         self.process_app_store()
+        self.drain_notifications()
+
+
+# created_at 을 해석할 수 없는 리뷰의 정렬용 시각
+OLDEST = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def parse_timestamp(value):
+    """ISO 8601 문자열 → aware datetime (오프셋이 없으면 UTC 로 간주, 비었거나 형식이 다르면 None)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def rss_entry_ids(text):
+    """http_cache 지문 비교에 쓰는 RSS <entry> 의 <id> 집합 (XML 파싱 없이 정규식으로 추출)"""
+    ids = set(RSS_ENTRY_ID.findall(text))
+    return ids or None
+
+
+def iter_feed_entries(chunks):
+    """바이트 청크를 XMLPullParser로 흘려보내며 닫히는 <entry> 요소를 하나씩 반환
+
+    사용한 entry는 트리에서 제거해 피드 전체를 메모리에 들고 있지 않는다.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    root = None
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if root is None:
+                    root = elem
+                continue
+            if elem.tag == f'{ATOM_NS}entry':
+                yield elem
+                elem.clear()
+                if root is not None:
+                    root.remove(elem)
+    parser.close()
+
+
+def restore_continuation_token(token, page_size):
+    """저장해 둔 token 문자열로 google_play_scraper의 continuation token을 복원"""
+    from google_play_scraper.features.reviews import _ContinuationToken
+    # reviews() 는 복원된 token 의 sort 를 그대로 요청 본문에 넣으므로 Enum 이 아닌 값(int)을 넘긴다
+    return _ContinuationToken(token, 'ko', 'kr', Sort.NEWEST.value, page_size, None, None)
+
+
+def run_all(apps, max_workers=MAX_WORKERS, backfill=False, since=None):
+    """모든 앱의 Google Play / App Store 작업을 워커 풀에서 동시에 실행
+
+    한 앱이 실패해도 다른 앱은 계속 처리되며, 수집이 끝나면 앱별 outbox 를 발송하고 소요 시간을 출력한다.
+    backfill=True 이면 Google Play는 커서(또는 since 날짜)까지 모든 페이지를 따라간다.
+    """
+    started = time.perf_counter()
+    tasks = []
+    scrapers = {}
+    for app_key, app_config in apps.items():
+        try:
+            scraper = AppReviewScraper(**app_config)
+        except Exception as e:
+            print(f"❌ {app_key} 초기화 실패: {e}")
+            continue
+        scrapers[app_key] = scraper
+        if backfill:
+            tasks.append(((app_key, "google_play"), partial(scraper.backfill_google_play, since=since)))
+        else:
+            tasks.append(((app_key, "google_play"), scraper.process_google_play))
+        tasks.append(((app_key, "app_store"), scraper.process_app_store))
+
+    results = run_tasks(tasks, max_workers)
+    # 저장이 끝난 뒤 앱(webhook)별 미발송 리뷰를 병렬로 발송
+    notifications = run_tasks(
+        [(app_key, scraper.drain_notifications) for app_key, scraper in scrapers.items()], max_workers
+    )
+
+    print(f"\n⏱️ 실행 요약 (총 {time.perf_counter() - started:.2f}s)")
+    for app_key in apps:
+        for platform in ("google_play", "app_store"):
+            result = results.get((app_key, platform))
+            if result is None:
+                continue
+            status = "✅" if result['ok'] else f"❌ {result['error']}"
+            print(f"  {app_key:<12} {platform:<12} {result['elapsed']:6.2f}s {status}")
+        notified = notifications.get(app_key)
+        if notified is not None:
+            status = format_stats(notified['result']) if notified['ok'] else f"❌ {notified['error']}"
+            print(f"  {app_key:<12} {'slack':<12} {status}")
+    return results
 
 
 if __name__ == "__main__":
-    for app_name, app_config in APPS.items():
-        print(f"\nProcessing {app_name}...")
-        scraper = AppReviewScraper(**app_config)
-        scraper.run() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="앱 리뷰 수집")
+    parser.add_argument("--backfill", action="store_true",
+                        help="Google Play continuation token을 따라 커서(또는 --since)까지 과거 리뷰를 수집")
+    parser.add_argument("--since", help="backfill 하한 날짜 (YYYY-MM-DD)")
+    args = parser.parse_args()
+    run_all(APPS, backfill=args.backfill, since=args.since) 
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""asyncio 기반 스크래핑 엔진
+
+하나의 이벤트 루프(스레드 하나)에서 여러 스크래퍼의 HTTP 요청을 동시에 처리한다.
+  - AsyncEngine: 비동기 HTTP 클라이언트 (httpx 가 있으면 httpx.AsyncClient, 없으면 transport 를 executor 에서 실행)
+                 + 동기 SDK(Supabase, google_play_scraper, 커서 저장소, Slack 큐)를 executor 에서 돌리는 run_sync
+                 + 호스트별 동시 요청 수 제한
+  - AsyncTokenBucket: concurrency.TokenBucket 의 asyncio 버전
+  - TaskGraph: 의존 관계가 있는 비동기 작업을 가능한 한 동시에 실행
+
+환경변수:
+    ASYNC_MAX_CONNECTIONS  전체 동시 연결 수 (기본 200)
+    ASYNC_HOST_LIMIT       호스트별 기본 동시 요청 수 (기본 8)
+    ASYNC_SYNC_WORKERS     동기 작업용 executor 스레드 수 (기본 16)
+    HTTP_TIMEOUT / HTTP_RETRIES / HTTP_BACKOFF  transport 와 같은 의미
+"""
+import asyncio
+import functools
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import transport
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+ASYNC_MAX_CONNECTIONS = int(os.getenv("ASYNC_MAX_CONNECTIONS", "200"))
+ASYNC_HOST_LIMIT = int(os.getenv("ASYNC_HOST_LIMIT", "8"))
+ASYNC_SYNC_WORKERS = int(os.getenv("ASYNC_SYNC_WORKERS", "16"))
+
+# transport 의 urllib3 Retry 설정과 같은 재시도 대상
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class AsyncTokenBucket:
+    """초당 rate 개의 토큰을 채우는 토큰 버킷 (이벤트 루프를 막지 않고 대기)"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncEngine:
+    """async with AsyncEngine(host_limits) as engine: 안에서 get / post / run_sync 사용"""
+
+    def __init__(self, host_limits=None, default_limit=ASYNC_HOST_LIMIT,
+                 max_connections=ASYNC_MAX_CONNECTIONS, sync_workers=ASYNC_SYNC_WORKERS):
+        self.host_limits = dict(host_limits or {})
+        self.default_limit = default_limit
+        self.max_connections = max_connections
+        self.timeout = float(os.getenv("HTTP_TIMEOUT", "10"))
+        self.retries = int(os.getenv("HTTP_RETRIES", "3"))
+        self.backoff = float(os.getenv("HTTP_BACKOFF", "0.5"))
+        self.executor = ThreadPoolExecutor(max_workers=sync_workers, thread_name_prefix="async-sync")
+        self.client = None
+        self._semaphores = {}
+
+    async def __aenter__(self):
+        if httpx is not None:
+            self.client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                transport=httpx.AsyncHTTPTransport(retries=self.retries),
+            )
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.client is not None:
+            await self.client.aclose()
+        self.executor.shutdown(wait=True)
+
+    def slot(self, host):
+        """호스트별 동시 실행 수 제한 세마포어"""
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.host_limits.get(host, self.default_limit))
+        return self._semaphores[host]
+
+    async def run_sync(self, fn, *args, host=None, **kwargs):
+        """동기 함수를 executor 에서 실행 (host 가 주어지면 해당 호스트 제한 안에서)"""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        if host is None:
+            return await loop.run_in_executor(self.executor, call)
+        async with self.slot(host):
+            return await loop.run_in_executor(self.executor, call)
+
+    async def request(self, method, url, **kwargs):
+        """httpx.Response (또는 fallback 시 requests.Response) 반환, 429 / 5xx 는 GET 만 재시도"""
+        host = urlparse(url).netloc
+        if self.client is None:
+            return await self.run_sync(transport.request, method, url, host=host, **kwargs)
+
+        for attempt in range(self.retries + 1):
+            async with self.slot(host):
+                response = await self.client.request(method, url, **kwargs)
+            if response.status_code not in RETRY_STATUSES or method != "GET" or attempt == self.retries:
+                return response
+            retry_after = response.headers.get("Retry-After")
+            try:
+                wait = float(retry_after) if retry_after else self.backoff * 2 ** attempt
+            except ValueError:
+                wait = self.backoff * 2 ** attempt
+            await asyncio.sleep(wait)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+
+class TaskGraph:
+    """이름이 붙은 비동기 작업과 의존 관계
+
+    graph.add("notify", fn, deps=["google_play", "app_store"])
+    results = await graph.run()   # {name: {'ok', 'result', 'error', 'elapsed'}} (concurrency.run_tasks 와 같은 형태)
+
+    의존 작업이 실패하면 기본적으로 건너뛰고, require_success=False 인 작업은 끝나기만 기다린 뒤 실행한다.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+
+    def add(self, name, fn, deps=(), require_success=True):
+        if name in self.nodes:
+            raise ValueError(f"duplicate task: {name}")
+        self.nodes[name] = (fn, tuple(deps), require_success)
+
+    def check(self):
+        """알 수 없는 의존 작업이나 순환 의존이 있으면 ValueError"""
+        visiting, done = set(), set()
+
+        def visit(name, path):
+            if name not in self.nodes:
+                raise ValueError(f"unknown dependency: {name} (required by {path[-1]})")
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.nodes[name][1]:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.nodes:
+            visit(name, [])
+
+    async def run(self):
+        self.check()
+        tasks = {}
+
+        async def run_node(name):
+            fn, deps, require_success = self.nodes[name]
+            if deps:
+                await asyncio.wait([tasks[dep] for dep in deps])
+            failed = [dep for dep in deps if not tasks[dep].result()['ok']]
+            if failed and require_success:
+                error = RuntimeError(f"skipped: dependency failed ({', '.join(failed)})")
+                return {'ok': False, 'result': None, 'error': error, 'elapsed': 0.0}
+            started = time.perf_counter()
+            try:
+                result = await fn()
+                return {'ok': True, 'result': result, 'error': None, 'elapsed': time.perf_counter() - started}
+            except Exception as e:
+                print(f"❌ {name}: {e!r}", file=sys.stderr)
+                return {'ok': False, 'result': None, 'error': e, 'elapsed': time.perf_counter() - started}
+
+        for name in self.nodes:
+            tasks[name] = asyncio.ensure_future(run_node(name))
+        await asyncio.gather(*tasks.values())
+        return {name: task.result() for name, task in tasks.items()}
@@ -0,0 +1,76 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+
+class HostLimiter:
+    """원격 호스트별 동시 요청 수를 제한하는 세마포어 모음"""
+
+    def __init__(self, limits, default=4):
+        self.default = default
+        self._limits = dict(limits)
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self._limits.get(host, self.default))
+            return self._semaphores[host]
+
+    @contextmanager
+    def slot(self, host):
+        sem = self.semaphore(host)
+        sem.acquire()
+        try:
+            yield
+        finally:
+            sem.release()
+
+
+def run_tasks(tasks, max_workers):
+    """(key, callable) 목록을 워커 풀에서 동시에 실행하고 결과를 모아 반환
+
+    하나의 작업이 실패해도 나머지는 계속 실행된다.
+    반환값: {key: {'ok': bool, 'elapsed': float, 'error': Exception | None, 'result': Any}}
+    """
+    def timed(fn):
+        start = time.perf_counter()
+        try:
+            return {'ok': True, 'result': fn(), 'error': None, 'elapsed': time.perf_counter() - start}
+        except Exception as e:
+            return {'ok': False, 'result': None, 'error': e, 'elapsed': time.perf_counter() - start}
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(timed, fn): key for key, fn in tasks}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+class TokenBucket:
+    """초당 rate 개의 토큰을 채우는 토큰 버킷 (capacity 만큼 순간 버스트 허용)"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,132 @@
+"""스크래퍼별 마지막 처리 위치(high-water mark)를 저장하는 커서 저장소
+
+환경변수:
+    CURSOR_BACKEND  json (기본) | sqlite | supabase
+    CURSOR_PATH     json / sqlite 파일 경로 (기본 .scraper_cursors.json / .scraper_cursors.sqlite3)
+    CURSOR_TABLE    supabase 백엔드 테이블명 (기본 scraper_cursors)
+
+GitHub Actions 처럼 실행마다 파일시스템이 초기화되는 환경에서는 supabase 백엔드를 사용한다.
+supabase 백엔드 테이블 스키마:
+    create table scraper_cursors (
+        key text primary key,
+        value jsonb not null,
+        updated_at timestamptz default now()
+    );
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timezone
+
+import transport
+
+
+class JsonCursorStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except FileNotFoundError:
+                self._data = {}
+        return self._data
+
+    def get(self, key):
+        with self._lock:
+            return self._load().get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            data = self._load()
+            data[key] = value
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+class SqliteCursorStore:
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "create table if not exists scraper_cursors ("
+            "key text primary key, value text not null, updated_at text not null)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("select value from scraper_cursors where key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value):
+        with self._lock:
+            self._conn.execute(
+                "insert into scraper_cursors (key, value, updated_at) values (?, ?, ?) "
+                "on conflict(key) do update set value = excluded.value, updated_at = excluded.updated_at",
+                (key, json.dumps(value, ensure_ascii=False), datetime.now(timezone.utc).isoformat())
+            )
+            self._conn.commit()
+
+
+class SupabaseCursorStore:
+    def __init__(self, table_name):
+        self.table_name = table_name
+
+    def get(self, key):
+        resp = transport.get_supabase().table(self.table_name) \
+            .select('value') \
+            .eq('key', key) \
+            .limit(1) \
+            .execute()
+        return resp.data[0]['value'] if resp.data else None
+
+    def set(self, key, value):
+        transport.get_supabase().table(self.table_name).upsert({
+            'key': key,
+            'value': value,
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        }, on_conflict='key').execute()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_cursor_store():
+    """설정된 백엔드의 커서 저장소를 프로세스당 하나 생성해 반환"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            backend = os.getenv("CURSOR_BACKEND", "json").lower()
+            if backend == "sqlite":
+                _store = SqliteCursorStore(os.getenv("CURSOR_PATH", ".scraper_cursors.sqlite3"))
+            elif backend == "supabase":
+                _store = SupabaseCursorStore(os.getenv("CURSOR_TABLE", "scraper_cursors"))
+            else:
+                _store = JsonCursorStore(os.getenv("CURSOR_PATH", ".scraper_cursors.json"))
+        return _store
+
+
+def get_cursor(key):
+    """커서 값을 반환 (저장소 오류 시 None → 처음부터 처리)"""
+    try:
+        return get_cursor_store().get(key)
+    except Exception as e:
+        print(f"Error reading cursor {key}: {e}", file=sys.stderr)
+        return None
+
+
+def set_cursor(key, value):
+    try:
+        get_cursor_store().set(key, value)
+    except Exception as e:
+        print(f"Error writing cursor {key}: {e}", file=sys.stderr)
@@ -1,30 +1,44 @@
 import os
-import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from urllib.parse import urlparse, parse_qs
-import json
+from urllib.parse import urljoin, urlparse, parse_qs
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import re
 import sys
-from supabase import create_client, Client
-import time
+import transport
+import http_cache
+from async_engine import AsyncTokenBucket
+from concurrency import TokenBucket
+from cursor_store import get_cursor, set_cursor
+from html_soup import make_soup, DC_LIST_ONLY, DC_DETAIL_ONLY
+from slack_queue import SlackQueue, format_stats
+import outbox
 
 load_dotenv(".env")
 
 # Configuration
 SLACK_WEBHOOK_URL = os.getenv("DCINSIDE_SLACK_WEBHOOK_URL", "")
-DC_GALLERY_URL = "https://gall.dcinside.com/mgallery/board/lists/?id=plabfootball"
+DC_GALLERY_URL = os.getenv("DC_GALLERY_URL", "https://gall.dcinside.com/mgallery/board/lists/?id=plabfootball")
+DC_CURSOR_KEY = "dcinside:plabfootball"
+
+# 상세 페이지 요청 속도 제한 (초당 요청 수 / 동시 요청 수)
+DC_REQUESTS_PER_SECOND = float(os.getenv("DC_REQUESTS_PER_SECOND", "2"))
+DC_MAX_IN_FLIGHT = int(os.getenv("DC_MAX_IN_FLIGHT", "4"))
+
+RATE_LIMITER = TokenBucket(DC_REQUESTS_PER_SECOND)
+
+# outbox 의 새 게시글 알림을 메시지 하나에 여러 건씩 묶어 보내는 발송 큐
+SLACK_QUEUE = SlackQueue()
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124"
 }
 
-# Initialize Supabase client
-supabase: Client = create_client(
-    os.getenv("SUPABASE_URL", ""),
-    os.getenv("SUPABASE_KEY", "")
-)
+# http_cache 지문 비교에 쓰는 게시글 목록: tr.ub-content 의 post_id 집합 (BeautifulSoup 없이 정규식으로 추출)
+LIST_ROW_TAG = re.compile(r'<tr\b[^>]*\bub-content\b[^>]*>')
+LIST_ROW_ID = re.compile(r'\bdata-no="(\d+)"')
+LIST_FRAGMENT = re.compile(r'<tbody.*?</tbody>', re.S)
 
 def normalize_to_date_str(raw):
     """Normalize various DCInside date displays to YYYY-MM-DD.
@@ -85,12 +99,21 @@ def get_post_details(post_url):
         'date': 'YYYY-MM-DD' | None
     }
     """
-    content, normalized_date, detail_title, detail_author = None, None, None, None
     try:
-        response = requests.get(post_url, headers=HEADERS)
+        # Be nice to the server
+        RATE_LIMITER.acquire()
+        response = transport.get(post_url, headers=HEADERS)
         response.raise_for_status()
+    except Exception as e:
+        print(f"Error fetching post details: {e}", file=sys.stderr)
+        return {'title': None, 'author': None, 'content': None, 'date': None}
+    return parse_post_details(response.text)
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+def parse_post_details(html):
+    """상세 페이지 HTML 에서 제목 / 작성자 / 본문 / 작성일 추출 (중간에 실패하면 그때까지 찾은 값만 반환)"""
+    content, normalized_date, detail_title, detail_author = None, None, None, None
+    try:
+        soup = make_soup(html, only=DC_DETAIL_ONLY)
 
         # Extract title (try multiple selectors for robustness)
         title_selectors = [
@@ -140,7 +163,7 @@ def get_post_details(post_url):
             'date': normalized_date,
         }
     except Exception as e:
-        print(f"Error fetching post details: {e}", file=sys.stderr)
+        print(f"Error parsing post details: {e}", file=sys.stderr)
         return {
             'title': detail_title,
             'author': detail_author,
@@ -155,60 +178,90 @@ def get_post_content(post_url):
     except Exception:
         return None
 
+def get_post_list():
+    """목록 페이지만 파싱하여 (post_id, post_url) 목록을 반환 (상세 페이지는 요청하지 않음)"""
+    response = transport.get(DC_GALLERY_URL, headers=HEADERS)
+    response.raise_for_status()
+    return parse_post_list(response.text)
+
+def list_fingerprint(html):
+    """목록의 post_id 집합 (조회수 / 댓글 수만 바뀐 목록은 같은 지문), 찾지 못하면 <tbody> 부분"""
+    ids = set()
+    for tag in LIST_ROW_TAG.finditer(html):
+        match = LIST_ROW_ID.search(tag.group(0))
+        if match:
+            ids.add(match.group(1))
+    if ids:
+        return ids
+    match = LIST_FRAGMENT.search(html)
+    return match.group(0) if match else None
+
+def parse_post_list(html):
+    """목록 페이지 HTML → (post_id, post_url) 목록"""
+    soup = make_soup(html, only=DC_LIST_ONLY)
+    rows = []
+
+    # Find all post rows
+    for row in soup.select('tr.ub-content'):
+        try:
+            # Extract post url
+            title_element = row.select_one('td.gall_tit a')
+            if not title_element:
+                continue
+            post_url = urljoin(DC_GALLERY_URL, title_element['href'])
+            qs = parse_qs(urlparse(post_url).query)
+            post_id = normalize_post_id(qs.get("no", [None])[0])
+            if not post_id:
+                continue
+            rows.append((post_id, post_url))
+        except Exception as e:
+            print(f"Error parsing post: {e}", file=sys.stderr)
+            continue
+    return rows
+
+def fetch_posts(rows):
+    """(post_id, post_url) 목록의 상세 페이지를 병렬로 (속도 제한 하에) 가져와 게시글 목록으로 변환"""
+    with ThreadPoolExecutor(max_workers=max(1, DC_MAX_IN_FLIGHT)) as executor:
+        details_list = list(executor.map(get_post_details, [url for _, url in rows]))
+    return build_posts(rows, details_list)
+
+def build_posts(rows, details_list):
+    posts = []
+    for (post_id, post_url), details in zip(rows, details_list):
+        # Use only detail values (no fallback to list for title/author/date)
+        posts.append({
+            'post_id': post_id,
+            'title': details.get('title') or '',
+            'url': post_url,
+            'author': details.get('author') or '',
+            'date': details.get('date') or normalize_to_date_str(None),
+            'content': details.get('content'),
+            'created_at': datetime.now().isoformat()
+        })
+    return posts
+
 def get_posts():
     try:
-        response = requests.get(DC_GALLERY_URL, headers=HEADERS)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        posts = []
-        
-        # Find all post rows
-        post_rows = soup.select('tr.ub-content')
-        
-        for row in post_rows:
-            try:
-                # Extract post url
-                title_element = row.select_one('td.gall_tit a')
-                if not title_element:
-                    continue
-                post_url = "https://gall.dcinside.com" + title_element['href']
-                qs = parse_qs(urlparse(post_url).query)
-                post_id = normalize_post_id(qs.get("no", [None])[0])
-                if not post_id:
-                    continue
-                
-                # Get post details (title, author, content, date)
-                details = get_post_details(post_url)
-
-                # Use only detail values (no fallback to list for title/author/date)
-                title = details.get('title')
-                author = details.get('author')
-                content = details.get('content')
-                date = details.get('date')
-                
-                posts.append({
-                    'post_id': post_id,
-                    'title': title or '',
-                    'url': post_url,
-                    'author': author or '',
-                    'date': date or normalize_to_date_str(None),
-                    'content': content,
-                    'created_at': datetime.now().isoformat()
-                })
-                
-                # Be nice to the server
-                time.sleep(1)
-                
-            except Exception as e:
-                print(f"Error parsing post: {e}", file=sys.stderr)
-                continue
-                
-        return posts
+        return fetch_posts(get_post_list())
     except Exception as e:
         print(f"Error fetching posts: {e}", file=sys.stderr)
         return []
 
+def get_existing_post_ids(post_ids):
+    """dc_posts 에 이미 저장된 post_id 집합을 한 번의 in_ 조회로 반환"""
+    pids = sorted({pid for pid in (normalize_post_id(p) for p in post_ids) if pid})
+    if not pids:
+        return set()
+    resp = (
+        transport.get_supabase().table('dc_posts')
+        .select('post_id')
+        .in_('post_id', pids)
+        .execute()
+    )
+    existing = {normalize_post_id(row['post_id']) for row in resp.data}
+    print(f"[exists] checked={len(pids)} existing={len(existing)}", file=sys.stderr)
+    return existing
+
 def is_post_exists(post_id):
     try:
         pid = normalize_post_id(post_id)
@@ -216,7 +269,7 @@ def is_post_exists(post_id):
             print("[exists] normalize -> None", file=sys.stderr)
             return False
         resp = (
-            supabase.table('dc_posts')
+            transport.get_supabase().table('dc_posts')
             .select('id', count='exact', head=True)
             .eq('post_id', pid)
             .execute()
@@ -241,7 +294,9 @@ def save_post(post) -> bool:
     try:
         post['post_id'] = normalize_post_id(post.get('post_id'))
         post['created_at'] = datetime.utcnow().isoformat() + 'Z'
-        r = (supabase
+        post['notified'] = False  # outbox: 알림은 drain 단계에서 발송
+        post['notify_attempts'] = 0
+        r = (transport.get_supabase()
              .table('dc_posts')
              .upsert(post, on_conflict='post_id')
              .execute())
@@ -251,7 +306,8 @@ def save_post(post) -> bool:
         print(f"Error saving post: {e}", file=sys.stderr)
         return False
 
-def send_to_slack(post):
+def slack_notification(post):
+    """outbox 의 게시글 행 → (webhook, blocks, text)"""
     # 본문이 너무 길 경우 잘라서 표시
     content_preview = post['content'][:200] + '...' if post['content'] and len(post['content']) > 200 else post['content']
     
@@ -305,28 +361,98 @@ def send_to_slack(post):
         ]
     }
     
-    try:
-        response = requests.post(
-            SLACK_WEBHOOK_URL,
-            data=json.dumps(message),
-            headers={'Content-Type': 'application/json'}
-        )
-        response.raise_for_status()
-        print(f"Successfully sent post to Slack: {post['title']}")
-    except Exception as e:
-        print(f"Error sending to Slack: {e}", file=sys.stderr)
+    return SLACK_WEBHOOK_URL, message["blocks"], f"새 게시글: {post['title']}"
+
+def new_list_rows(page, cursor):
+    """조건부 요청으로 받은 목록에서 high-water mark 이후 (post_id, post_url) 목록
+
+    목록이 바뀌지 않았거나 새 게시글이 없고 미발송 알림도 없으면 None (할 일 없음, 바뀐 목록이면 검증자만 저장)
+    """
+    # 304 는 httpx(AsyncEngine) 에서 raise_for_status() 가 예외를 내므로 먼저 확인
+    if not page.changed:
+        if not cursor.get('pending'):
+            print(f"[http] list unchanged since last run ({page.reason})", file=sys.stderr)
+            return None
+        return []
+    page.response.raise_for_status()
+    high_water = cursor.get('post_id', 0)
+    rows = [(post_id, url) for post_id, url in parse_post_list(page.text) if post_id > high_water]
+    if not rows and not cursor.get('pending'):
+        print(f"[cursor] no posts newer than {high_water}", file=sys.stderr)
+        return None
+    return rows
+
+def finish(cursor, rows, posts):
+    """게시글 저장(notified=false) → outbox drain → 커서 전진, 모든 게시글을 저장했으면 True"""
+    high_water = cursor.get('post_id', 0)
+    failed = []
+    for post in posts:
+        if not save_post(post):           # notified=false 로 저장
+            failed.append(post['post_id'])
+
+    # 저장된 게시글(이전 실행에서 못 보낸 것 포함)을 outbox 에서 묶어서 슬랙 전송
+    notified = outbox.drain('dc_posts', slack_notification, queue=SLACK_QUEUE)
+    print(format_stats(notified), file=sys.stderr)
+
+    # 저장에 실패한 게시글은 다음 실행에서 다시 시도하도록 그 앞까지만 커서를 전진
+    new_high_water = max([high_water] + [post_id for post_id, _ in rows])
+    if failed:
+        new_high_water = min(new_high_water, min(failed) - 1)
+    # 미발송 알림이 남으면 새 게시글이 없어도 다음 실행에서 drain 하도록 표시
+    if new_high_water > high_water or bool(cursor.get('pending')) != notified['remaining']:
+        set_cursor(DC_CURSOR_KEY, {'post_id': new_high_water, 'pending': notified['remaining']})
+    return not failed
 
 def main():
     try:
-        current_posts = get_posts()
-        
-        for post in current_posts:
-            if not is_post_exists(post['post_id']):
-                if save_post(post):           # 저장이 성공했을 때만
-                    send_to_slack(post)       # 슬랙 전송
+        # 목록만 먼저 (조건부 요청으로) 받아 파싱하고, 마지막으로 본 post_id(high-water mark) 이후 게시글만 남김
+        cursor = get_cursor(DC_CURSOR_KEY) or {}
+        page = http_cache.get(DC_GALLERY_URL, fragment=list_fingerprint, headers=HEADERS)
+        rows = new_list_rows(page, cursor)
+        if rows is None:
+            http_cache.remember(page)
+            return
+
+        # 저장되지 않은 게시글만 상세 페이지를 요청
+        existing = get_existing_post_ids([post_id for post_id, _ in rows])
+        new_rows = [(post_id, url) for post_id, url in rows if post_id not in existing]
+        # 저장에 실패한 게시글이 있으면 검증자를 남기지 않아 다음 실행에서 목록을 다시 처리
+        if finish(cursor, rows, fetch_posts(new_rows)):
+            http_cache.remember(page)
     except Exception as e:
         print(f"Error in main: {e}", file=sys.stderr)
         sys.exit(1)
 
+async def main_async(engine):
+    """main() 과 같은 흐름을 AsyncEngine 위에서 실행 (상세 페이지는 이벤트 루프에서 동시에 요청)
+
+    오류는 sys.exit 대신 그대로 올려 보내 TaskGraph 결과에 기록되게 한다.
+    """
+    cursor = await engine.run_sync(get_cursor, DC_CURSOR_KEY) or {}
+    page = await http_cache.get_async(engine, DC_GALLERY_URL, fragment=list_fingerprint, headers=HEADERS)
+    rows = new_list_rows(page, cursor)
+    if rows is None:
+        await engine.run_sync(http_cache.remember, page)
+        return
+
+    existing = await engine.run_sync(get_existing_post_ids, [post_id for post_id, _ in rows], host="supabase")
+    new_rows = [(post_id, url) for post_id, url in rows if post_id not in existing]
+
+    limiter = AsyncTokenBucket(DC_REQUESTS_PER_SECOND)
+
+    async def details(post_url):
+        await limiter.acquire()
+        try:
+            detail = await engine.get(post_url, headers=HEADERS)
+            detail.raise_for_status()
+        except Exception as e:
+            print(f"Error fetching post details: {e}", file=sys.stderr)
+            return {'title': None, 'author': None, 'content': None, 'date': None}
+        return parse_post_details(detail.text)
+
+    details_list = await asyncio.gather(*(details(url) for _, url in new_rows))
+    if await engine.run_sync(finish, cursor, rows, build_posts(new_rows, details_list)):
+        await engine.run_sync(http_cache.remember, page)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,153 @@
+"""한국 공휴일 / 휴무일(주말 + 공휴일) 달력 인덱스
+
+data/kr_holidays.json 의 규칙(양력 고정 공휴일, 연도별 음력 공휴일 양력 환산일, 임시공휴일)과
+대체공휴일 규칙으로 연도별 공휴일을 계산하고, 휴무일을 서수(date.toordinal()) 집합으로 미리 만들어 둔다.
+    - is_non_working(date) / is_holiday(date) / is_weekend(date): O(1)
+    - non_working_days(start, end): 구간 길이에 비례 (O(n))
+처음 조회하는 연도는 그때 한 번 인덱스에 추가된다. 음력 날짜가 데이터 파일에 없는 연도는
+양력 공휴일만 계산하고 경고를 출력하므로, 새 연도의 설날 / 부처님오신날 / 추석은 데이터 파일에 추가한다.
+
+대체공휴일 (공휴일에 관한 법률 시행령 기준):
+    설날 / 추석 연휴   일요일 또는 다른 공휴일과 겹치면 연휴 다음 첫 평일
+    어린이날          토 / 일요일 또는 다른 공휴일과 겹치면 다음 첫 평일
+    삼일절 / 광복절 / 개천절 / 한글날 / 부처님오신날 / 기독탄신일   토 / 일요일과 겹치면 다음 첫 평일
+    신정 / 현충일      없음
+
+환경변수:
+    HOLIDAY_DATA_PATH  공휴일 규칙 파일 경로 (기본 automation/data/kr_holidays.json)
+"""
+import datetime
+import json
+import os
+import sys
+import threading
+
+HOLIDAY_DATA_PATH = os.getenv(
+    "HOLIDAY_DATA_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "kr_holidays.json")
+)
+
+SATURDAY, SUNDAY = 5, 6
+
+# 대체공휴일 규칙 → 겹침을 판단할 요일
+SUBSTITUTE_WEEKDAYS = {
+    "none": (),
+    "weekend": (SATURDAY, SUNDAY),
+    "weekend_or_holiday": (SATURDAY, SUNDAY),
+    "sunday_or_holiday": (SUNDAY,),
+}
+SUBSTITUTE_ON_HOLIDAY = {"weekend_or_holiday", "sunday_or_holiday"}
+
+
+def load_rules(path=HOLIDAY_DATA_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def holidays_for_year(year, rules):
+    """{date: [공휴일 이름, ...]} (대체공휴일 포함)"""
+    holidays = {}
+    groups = []  # (이름, 연휴 날짜 목록, 대체공휴일 규칙)
+
+    def add(day, name):
+        holidays.setdefault(day, []).append(name)
+
+    for rule in rules.get("fixed", []):
+        month, day = (int(x) for x in rule["date"].split("-"))
+        days = [datetime.date(year, month, day)]
+        groups.append((rule["name"], days, rule.get("substitute", "none")))
+
+    for rule in rules.get("lunar", []):
+        base = rule.get("dates", {}).get(str(year))
+        if base is None:
+            print(f"⚠️ {year}년 {rule['name']} 날짜가 공휴일 데이터에 없습니다.", file=sys.stderr)
+            continue
+        base = datetime.date.fromisoformat(base)
+        before, after = rule.get("span", [0, 0])
+        days = [base + datetime.timedelta(days=offset) for offset in range(before, after + 1)]
+        groups.append((rule["name"], days, rule.get("substitute", "none")))
+
+    for name, days, _ in groups:
+        for day in days:
+            add(day, name)
+    for rule in rules.get("extra", []):
+        day = datetime.date.fromisoformat(rule["date"])
+        if day.year == year:
+            add(day, rule["name"])
+
+    # 대체공휴일: 날짜 순으로 정해 앞에서 정한 대체공휴일과도 겹치지 않게 함
+    for name, days, policy in sorted(groups, key=lambda group: group[1][0]):
+        weekdays = SUBSTITUTE_WEEKDAYS[policy]
+        overlaps = any(day.weekday() in weekdays for day in days)
+        if policy in SUBSTITUTE_ON_HOLIDAY:
+            overlaps = overlaps or any(len(holidays[day]) > 1 for day in days)
+        if not overlaps:
+            continue
+        day = days[-1] + datetime.timedelta(days=1)
+        while day.weekday() >= SATURDAY or day in holidays:
+            day += datetime.timedelta(days=1)
+        add(day, f"대체공휴일({name})")
+    return holidays
+
+
+class HolidayCalendar:
+    """연도 단위로 채워지는 휴무일 인덱스 (서수 집합)"""
+
+    def __init__(self, rules=None, years=()):
+        self.rules = rules if rules is not None else load_rules()
+        self._holidays = {}        # 서수 → [공휴일 이름, ...]
+        self._non_working = set()  # 주말 + 공휴일 서수
+        self._years = set()
+        self._lock = threading.Lock()
+        for year in years:
+            self.ensure_year(year)
+
+    def ensure_year(self, year):
+        if year in self._years:
+            return
+        with self._lock:
+            if year in self._years:
+                return
+            for day, names in holidays_for_year(year, self.rules).items():
+                self._holidays[day.toordinal()] = names
+                self._non_working.add(day.toordinal())
+            first = datetime.date(year, 1, 1).toordinal()
+            last = datetime.date(year, 12, 31).toordinal()
+            # 0001-01-01(서수 1) 이 월요일이므로 (서수 - 1) % 7 이 weekday()
+            self._non_working.update(o for o in range(first, last + 1) if (o - 1) % 7 >= SATURDAY)
+            self._years.add(year)
+
+    def holiday_names(self, day):
+        self.ensure_year(day.year)
+        return self._holidays.get(day.toordinal(), [])
+
+    def is_holiday(self, day):
+        self.ensure_year(day.year)
+        return day.toordinal() in self._holidays
+
+    def is_weekend(self, day):
+        return day.weekday() >= SATURDAY
+
+    def is_non_working(self, day):
+        self.ensure_year(day.year)
+        return day.toordinal() in self._non_working
+
+    def non_working_days(self, start, end):
+        """start ~ end(포함) 사이의 휴무일을 날짜 순으로 반환"""
+        for year in range(start.year, end.year + 1):
+            self.ensure_year(year)
+        for ordinal in range(start.toordinal(), end.toordinal() + 1):
+            if ordinal in self._non_working:
+                yield datetime.date.fromordinal(ordinal)
+
+
+_calendar = None
+_calendar_lock = threading.Lock()
+
+
+def get_calendar():
+    """프로세스당 하나의 달력을 처음 사용할 때 생성해 반환"""
+    global _calendar
+    with _calendar_lock:
+        if _calendar is None:
+            _calendar = HolidayCalendar()
+        return _calendar
@@ -0,0 +1,47 @@
+"""BeautifulSoup 생성 헬퍼
+
+lxml 이 설치되어 있으면 lxml 파서를, 없으면 html.parser 를 사용한다 (HTML_PARSER 환경변수로 강제 가능).
+각 스크래퍼는 필요한 노드만 SoupStrainer 로 골라 파싱해 전체 트리를 만들지 않는다.
+"""
+import os
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = "lxml"
+except ImportError:
+    DEFAULT_PARSER = "html.parser"
+
+PARSER = os.getenv("HTML_PARSER", DEFAULT_PARSER)
+
+
+def has_class(*names):
+    """class 속성에 names 중 하나가 포함된 태그와 매칭되는 패턴
+
+    파싱 중(SoupStrainer)에는 class 값이 공백으로 나뉘지 않은 문자열로 전달될 수 있어 정규식으로 비교한다.
+    """
+    return re.compile(r"(?:^|\s)(?:%s)(?:\s|$)" % "|".join(re.escape(n) for n in names))
+
+
+# DCInside 목록 페이지: 게시글 행만
+DC_LIST_ONLY = SoupStrainer("tr", class_=has_class("ub-content"))
+
+# DCInside 상세 페이지: 제목 / 작성자 / 본문 / 작성일 노드만
+DC_DETAIL_ONLY = SoupStrainer(
+    ["span", "div", "h3"],
+    class_=has_class(
+        "title_subject", "title_headtext", "title",
+        "nickname", "gall_writer", "ub-writer",
+        "write_div", "gall_date",
+    ),
+)
+
+# Longblack 홈: 오늘의 노트 링크만
+LONGBLACK_TODAY_ONLY = SoupStrainer("div", class_=has_class("today-note-link"))
+
+
+def make_soup(markup, only=None, parser=None):
+    """markup 을 파싱해 BeautifulSoup 을 반환 (only 가 주어지면 해당 노드만 파싱)"""
+    return BeautifulSoup(markup, parser or PARSER, parse_only=only)
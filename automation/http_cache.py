@@ -0,0 +1,113 @@
+"""URL 별 HTTP 검증자(ETag / Last-Modified) 캐시와 조건부 요청
+
+주기적으로 다시 받는 페이지(Longblack 홈, DCInside 목록, App Store RSS 1페이지)에
+If-None-Match / If-Modified-Since 를 붙여 요청하고, 304 Not Modified 면 파싱과 DB 작업을 건너뛴다.
+서버가 검증자를 주지 않거나 매번 바꾸는 경우에도 필요한 부분(fragment)의 해시(지문)가
+지난번과 같으면 바뀌지 않은 것으로 본다. fragment 가 ID 집합을 돌려주면 순서와 무관한 ID 집합의 지문을 비교해,
+조회수 / 댓글 수 / 시각 표시처럼 처리와 무관한 부분만 바뀐 목록도 건너뛴다.
+
+검증자와 해시는 커서 저장소(cursor_store)에 "http:<url>" 키로 저장되며,
+페이지 처리가 끝까지 성공한 뒤 remember() 로 기록한다. (처리 중 실패하면 다음 실행에서 다시 처리)
+
+    page = http_cache.get(url, fragment=..., headers=HEADERS)
+    if not page.changed:
+        return
+    ... page.text 처리 ...
+    http_cache.remember(page)
+
+환경변수:
+    HTTP_CACHE  0 이면 조건부 요청 / 해시 비교를 하지 않음 (기본 1)
+"""
+import hashlib
+import os
+
+import transport
+from cursor_store import get_cursor, set_cursor
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE", "1") != "0"
+KEY_PREFIX = "http:"
+
+
+class Page:
+    """조건부 요청 결과 (changed 가 False 면 지난번에 처리한 내용과 같음)"""
+
+    def __init__(self, url, response, validators, changed, reason=None):
+        self.url = url
+        self.response = response
+        self.validators = validators
+        self.changed = changed
+        self.reason = reason  # 바뀌지 않은 이유: 'not modified' (304) | 'fingerprint' (지문 일치)
+
+    @property
+    def text(self):
+        return self.response.text
+
+    @property
+    def content(self):
+        return self.response.content
+
+
+def cache_key(url):
+    return KEY_PREFIX + url
+
+
+def lookup(url):
+    """저장된 {'etag', 'last_modified', 'hash'} (없으면 빈 dict)"""
+    if not HTTP_CACHE_ENABLED:
+        return {}
+    return get_cursor(cache_key(url)) or {}
+
+
+def conditional_headers(cached):
+    headers = {}
+    if cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached.get('last_modified'):
+        headers['If-Modified-Since'] = cached['last_modified']
+    return headers
+
+
+def content_hash(text, fragment=None):
+    """fragment(text) 가 주어지면 그 부분(문자열 또는 ID 집합)만, 찾지 못하면 본문 전체를 해시"""
+    part = fragment(text) if fragment else None
+    if part is None:
+        part = text
+    elif not isinstance(part, str):
+        part = "\n".join(sorted(str(item) for item in part))
+    return hashlib.sha1(part.encode("utf-8")).hexdigest()
+
+
+def check(url, response, cached, fragment=None):
+    """응답(requests / httpx)과 저장된 검증자를 비교해 Page 로 변환"""
+    if response.status_code == 304:
+        return Page(url, response, cached, changed=False, reason="not modified")
+
+    validators = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+    if response.status_code != 200 or not HTTP_CACHE_ENABLED:
+        return Page(url, response, validators, changed=True)
+    validators['hash'] = content_hash(response.text, fragment)
+    if validators['hash'] == cached.get('hash'):
+        return Page(url, response, validators, changed=False, reason="fingerprint")
+    return Page(url, response, validators, changed=True)
+
+
+def get(url, fragment=None, headers=None, **kwargs):
+    cached = lookup(url)
+    response = transport.get(url, headers={**(headers or {}), **conditional_headers(cached)}, **kwargs)
+    return check(url, response, cached, fragment)
+
+
+async def get_async(engine, url, fragment=None, headers=None, **kwargs):
+    """get() 의 AsyncEngine 버전 (저장소 조회는 executor 에서)"""
+    cached = await engine.run_sync(lookup, url)
+    response = await engine.get(url, headers={**(headers or {}), **conditional_headers(cached)}, **kwargs)
+    return check(url, response, cached, fragment)
+
+
+def remember(page):
+    """처리가 끝난 페이지의 검증자 / 해시를 저장 (바뀌지 않은 페이지는 저장하지 않음)"""
+    if HTTP_CACHE_ENABLED and page.changed and page.response.status_code == 200:
+        set_cursor(cache_key(page.url), page.validators)
@@ -1,34 +1,43 @@
-import requests
-from bs4 import BeautifulSoup
 import datetime
 import pytz
-from supabase import create_client, Client
 import os
+import re
 from dotenv import load_dotenv
-import json
+import transport
+import http_cache
+from cursor_store import get_cursor, set_cursor
+from html_soup import make_soup, LONGBLACK_TODAY_ONLY
+from slack_queue import SlackQueue, section
+import outbox
 
 # Load environment variables
 load_dotenv(".env")
 
-SUPABASE_URL = os.getenv("SUPABASE_URL", "")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 SLACK_WEBHOOK_URL = os.getenv("DEV_ARTICLE_SLACK_WEBHOOK_URL", "")
+LONGBLACK_URL = os.getenv("LONGBLACK_URL", "https://www.longblack.co/")
+CURSOR_KEY = "longblack:today_note"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0"
+}
+SLACK_QUEUE = SlackQueue()
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# http_cache 해시 비교에 쓰는 오늘의 노트 링크 부분 (홈의 나머지 영역이 바뀌어도 무시)
+TODAY_NOTE_FRAGMENT = re.compile(r'today-note-link.*?</a>', re.S)
 
 def get_kst_today():
     return datetime.datetime.now(pytz.timezone("Asia/Seoul")).strftime("%Y-%m-%d")
 
 def fetch_today_note_link():
-    url = "https://www.longblack.co/"
-    headers = {
-        "User-Agent": "Mozilla/5.0"
-    }
-
-    response = requests.get(url, headers=headers)
+    response = transport.get(LONGBLACK_URL, headers=HEADERS)
     response.raise_for_status()
+    return parse_today_note_link(response.text)
+
+def today_note_fragment(html):
+    match = TODAY_NOTE_FRAGMENT.search(html)
+    return match.group(0) if match else None
 
-    soup = BeautifulSoup(response.text, "html.parser")
+def parse_today_note_link(html):
+    soup = make_soup(html, only=LONGBLACK_TODAY_ONLY)
     link_container = soup.find("div", class_="today-note-link")
     if link_container:
         anchor = link_container.find("a", href=True)
@@ -38,6 +47,7 @@ def fetch_today_note_link():
 
 def save_to_supabase(article_url: str):
     today = get_kst_today()
+    supabase = transport.get_supabase()
 
     # 중복 방지
     existing = supabase.table("longblack_today_article").select("*").eq("url", article_url).execute()
@@ -48,36 +58,68 @@ def save_to_supabase(article_url: str):
     # 저장
     supabase.table("longblack_today_article").insert({
         "url": article_url,
-        "created_at": today
+        "created_at": today,
+        "notified": False,  # outbox: 알림은 drain 단계에서 발송
+        "notify_attempts": 0
     }).execute()
     print("Saved to Supabase.")
     return True
 
-def notify_slack(article_url: str):
-    message = {
-        "text": f"☕️ *Longblack 오늘의 노트 읽으러 가기* ☕️ \n{article_url}"
-    }
+def slack_notification(row):
+    """outbox 의 아티클 행 → (webhook, blocks, text)"""
+    text = f"☕️ *Longblack 오늘의 노트 읽으러 가기* ☕️ \n{row['url']}"
+    return SLACK_WEBHOOK_URL, [section(text)], text
 
-    response = requests.post(
-        SLACK_WEBHOOK_URL,
-        data=json.dumps(message),
-        headers={"Content-Type": "application/json"}
-    )
-
-    if response.status_code == 200:
+def notify_slack() -> bool:
+    """저장됐지만 아직 알리지 않은 아티클을 보내고, 남은 미발송 건이 없으면 True"""
+    result = outbox.drain("longblack_today_article", slack_notification, queue=SLACK_QUEUE)
+    if result["delivered"]:
         print("Slack notification sent.")
-    else:
-        print(f"Failed to send Slack message: {response.text}")
-
-def main():
-    print("🔍 Fetching today’s Longblack article...")
-    article_url = fetch_today_note_link()
+    if result["remaining"]:
+        print("Failed to send Slack message.")
+    return not result["remaining"]
+
+def process_article(article_url) -> bool:
+    """저장 → 알림 → 커서 저장, 알림까지 끝났으면 True"""
+    # 지난 실행에서 이미 처리한 링크면 DB 조회 없이 종료
+    cursor = get_cursor(CURSOR_KEY) or {}
+    if cursor.get("url") == article_url:
+        print("Today's article already processed (cursor).")
+        return True
+
+    save_to_supabase(article_url)
+    # 알림까지 끝난 경우에만 커서를 저장해, 발송 실패 시 다음 실행에서 다시 drain 하도록 함
+    if notify_slack():
+        set_cursor(CURSOR_KEY, {"url": article_url})
+        return True
+    return False
+
+def read_today_note_link(page):
+    """조건부 요청으로 받은 홈 페이지 처리 (바뀌지 않았으면 파싱 / DB 없이 종료)"""
+    # 304 는 httpx(AsyncEngine) 에서 raise_for_status() 가 예외를 내므로 먼저 확인
+    if not page.changed:
+        print(f"Longblack home unchanged since last run ({page.reason}).")
+        return None
+    page.response.raise_for_status()
+    article_url = parse_today_note_link(page.text)
     if not article_url:
         print("⚠️ 오늘의 노트 링크를 찾지 못했습니다.")
-        return
+        return None
+    return article_url
 
-    if save_to_supabase(article_url):
-        notify_slack(article_url)
+def main():
+    print("🔍 Fetching today’s Longblack article...")
+    page = http_cache.get(LONGBLACK_URL, fragment=today_note_fragment, headers=HEADERS)
+    article_url = read_today_note_link(page)
+    if article_url and process_article(article_url):
+        http_cache.remember(page)
+
+async def main_async(engine):
+    """main() 의 AsyncEngine 버전 (홈 요청만 이벤트 루프에서, DB / 슬랙은 executor 에서)"""
+    page = await http_cache.get_async(engine, LONGBLACK_URL, fragment=today_note_fragment, headers=HEADERS)
+    article_url = read_today_note_link(page)
+    if article_url and await engine.run_sync(process_article, article_url):
+        await engine.run_sync(http_cache.remember, page)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,118 @@
+"""알림 outbox: 새 행을 notified=false 로 함께 저장하고, drain 단계에서 모아 보낸 뒤 notified=true 로 표시
+
+저장과 Slack 발송을 분리해 두어 발송이 실패하거나 프로세스가 중간에 죽어도
+미발송 행이 DB 에 남아 다음 drain 에서 다시 보내진다.
+(발송 후 표시 전에 죽으면 한 번 더 보내질 수 있다: at-least-once)
+
+발송에 실패한 행은 notify_attempts 를 1 늘리고, Slack 이 4xx 로 거절한 행(다시 보내도 안 됨)이나
+OUTBOX_MAX_ATTEMPTS 번 실패한 행은 더 이상 가져오지 않는다(dead letter, notified=false 로 남음).
+다시 보내려면 해당 행의 notify_attempts 를 0 으로 되돌린다.
+
+배포 순서: supabase/migrations 의 notification_outbox(notified), notification_outbox_attempts(notify_attempts)
+마이그레이션을 먼저 적용한 뒤 이 코드를 배포한다. (컬럼이 없으면 저장과 drain 이 모두 실패한다)
+
+환경변수:
+    OUTBOX_BATCH_SIZE    한 번에 가져올 미발송 행 수 (기본 50)
+    OUTBOX_MAX_BATCHES   drain 한 번에 처리할 최대 배치 수 (기본 20)
+    OUTBOX_MAX_ATTEMPTS  행마다 발송을 시도할 최대 횟수 (기본 5)
+"""
+import os
+import sys
+import time
+
+import transport
+from slack_queue import SlackQueue
+
+OUTBOX_COLUMN = "notified"
+ATTEMPTS_COLUMN = "notify_attempts"
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_MAX_BATCHES = int(os.getenv("OUTBOX_MAX_BATCHES", "20"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+
+# in_ 조회 한 번에 넣을 키 개수 (PostgREST URL 길이 제한 대비)
+MARK_CHUNK_SIZE = 100
+
+
+def fetch_pending(table_name, limit=OUTBOX_BATCH_SIZE, key="id"):
+    """아직 알리지 않은 행(dead letter 제외)을 저장된 순서대로 반환"""
+    resp = transport.get_supabase().table(table_name) \
+        .select("*") \
+        .eq(OUTBOX_COLUMN, False) \
+        .lt(ATTEMPTS_COLUMN, OUTBOX_MAX_ATTEMPTS) \
+        .order(key) \
+        .limit(limit) \
+        .execute()
+    return resp.data
+
+
+def mark_notified(table_name, keys, key="id"):
+    keys = list(keys)
+    for i in range(0, len(keys), MARK_CHUNK_SIZE):
+        transport.get_supabase().table(table_name) \
+            .update({OUTBOX_COLUMN: True}) \
+            .in_(key, keys[i:i + MARK_CHUNK_SIZE]) \
+            .execute()
+
+
+def record_failures(table_name, rows, failed, rejected, key="id"):
+    """실패한 행의 notify_attempts 를 늘리고 (거절된 행은 바로 최대값으로) dead letter 가 된 키 목록을 반환"""
+    rejected = set(rejected)
+    by_attempts = {}
+    for row in rows:
+        if row[key] not in failed:
+            continue
+        attempts = OUTBOX_MAX_ATTEMPTS if row[key] in rejected else (row.get(ATTEMPTS_COLUMN) or 0) + 1
+        by_attempts.setdefault(attempts, []).append(row[key])
+
+    for attempts, keys in by_attempts.items():
+        for i in range(0, len(keys), MARK_CHUNK_SIZE):
+            transport.get_supabase().table(table_name) \
+                .update({ATTEMPTS_COLUMN: attempts}) \
+                .in_(key, keys[i:i + MARK_CHUNK_SIZE]) \
+                .execute()
+    dead = [k for attempts, keys in by_attempts.items() if attempts >= OUTBOX_MAX_ATTEMPTS for k in keys]
+    if dead:
+        print(f"⚠️ {table_name} 알림 {len(dead)}건을 더 이상 보내지 않습니다 (dead letter): {dead}", file=sys.stderr)
+    return dead
+
+
+def drain(table_name, to_notification, queue=None, key="id",
+          batch_size=OUTBOX_BATCH_SIZE, max_batches=OUTBOX_MAX_BATCHES):
+    """미발송 행을 배치 단위로 Slack 에 보내고 성공한 행만 notified=true 로 표시
+
+    to_notification(row) → (webhook_url, blocks, text)
+    다시 시도할 수 있는 실패가 있으면 그 배치에서 멈추고 다음 실행에서 다시 시도한다.
+    dead letter 가 된 행은 remaining 에 포함하지 않는다.
+    반환값: {'items', 'messages', 'retries', 'rate_limited', 'delivered', 'failed', 'dead_lettered',
+             'elapsed', 'remaining'}
+    """
+    queue = queue or SlackQueue()
+    started = time.perf_counter()
+    total = {"items": 0, "messages": 0, "retries": 0, "rate_limited": 0,
+             "delivered": [], "failed": [], "dead_lettered": [], "remaining": True}
+    try:
+        for _ in range(max(1, max_batches)):
+            rows = fetch_pending(table_name, batch_size, key)
+            if not rows:
+                total["remaining"] = False
+                break
+            for row in rows:
+                webhook_url, blocks, text = to_notification(row)
+                queue.enqueue(webhook_url, blocks, text, key=row[key])
+            result = queue.flush()
+            mark_notified(table_name, result["delivered"], key)
+            dead = record_failures(table_name, rows, set(result["failed"]), result.get("rejected", []), key)
+            retryable = len(result["failed"]) > len(dead)
+
+            for name in ("items", "messages", "retries", "rate_limited"):
+                total[name] += result[name]
+            total["delivered"].extend(result["delivered"])
+            total["failed"].extend(result["failed"])
+            total["dead_lettered"].extend(dead)
+            if retryable or len(rows) < batch_size:
+                total["remaining"] = retryable
+                break
+    except Exception as e:
+        print(f"Error draining outbox {table_name}: {e}", file=sys.stderr)
+    total["elapsed"] = time.perf_counter() - started
+    return total
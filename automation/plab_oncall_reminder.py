@@ -3,17 +3,12 @@ import json
 import datetime
 from typing import List, Dict
 from dotenv import load_dotenv
-import requests
-from supabase import create_client, Client
 import pytz
+import transport
+from holiday_calendar import get_calendar
 
 load_dotenv(".env")
 
-supabase: Client = create_client(
-    os.getenv("SUPABASE_URL", ""),
-    os.getenv("SUPABASE_KEY", "")
-)
-
 SLACK_WEBHOOK_URL = os.getenv("DEV_REQUEST_SLACK_WEBHOOK_URL", "")
 SLACK_CHANNEL = os.getenv("DEV_REQUEST_SLACK_CHANNEL_ID", "")
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN", "")
@@ -60,38 +55,8 @@ TEAM_MEMBERS = {
     }, 
 }
 
-# 2025-2026 Holidays (excluding weekends)
-HOLIDAYS = [
-    # 2025 Holidays
-    "2025-01-01",  # New Year's Day (수요일)
-    "2025-01-28",  # Lunar New Year (화요일)
-    "2025-01-29",  # Lunar New Year (수요일)
-    "2025-01-30",  # Lunar New Year (목요일)
-    "2025-05-05",  # Children's Day (월요일)
-    "2025-06-06",  # Memorial Day (금요일)
-    "2025-08-15",  # Liberation Day (금요일)
-    "2025-10-03",  # National Foundation Day (금요일)
-    "2025-10-06",  # Chuseok (월요일)
-    "2025-10-07",  # Chuseok (화요일)
-    "2025-10-08",  # Chuseok (수요일)
-    "2025-10-09",  # Hangeul Day (목요일)
-    "2025-12-25",  # Christmas Day (목요일)
-    
-    # 2026 Holidays
-    "2026-01-01",  # New Year's Day (목요일)
-    "2026-02-16",  # Lunar New Year (월요일)
-    "2026-02-17",  # Lunar New Year (화요일)
-    "2026-02-18",  # Lunar New Year (수요일)
-    "2026-03-02",  # 3.1 (화요일)
-    "2026-05-05",  # Children's Day (화요일)
-    "2026-05-25",  # Buddha's Birthday (금요일)
-    "2026-08-17",  # 광복절 (월요일)
-    "2026-09-24",  # Chuseok (목요일)
-    "2026-09-25",  # Chuseok (금요일)
-    "2026-10-05",  # 개천절 (금요일)
-    "2026-10-09",  # Hangeul Day (금요일)
-    "2026-12-25",  # Christmas Day (금요일)
-]
+# 주말 + 공휴일(대체공휴일 포함) 휴무일 인덱스 (holiday_calendar / data/kr_holidays.json)
+CALENDAR = get_calendar()
 
 def get_kst_now() -> datetime.datetime:
     """Get current time in KST."""
@@ -102,7 +67,7 @@ def get_current_oncall() -> str:
     """오늘 날짜의 온콜 담당자가 있으면 반환, 없으면 None 반환"""
     today = get_kst_now().strftime("%Y-%m-%d")
     try:
-        response = supabase.table("oncall_rotation").select("*").eq("date", today).order("id").limit(1).execute()
+        response = transport.get_supabase().table("oncall_rotation").select("*").eq("date", today).order("id").limit(1).execute()
         if response.data:
             return response.data[0]["member"]
         return None  # 오늘 온콜 담당자가 없으면 None 반환
@@ -114,7 +79,7 @@ def get_last_oncall_member() -> str:
     """오늘 이전까지 가장 마지막으로 온콜을 수행한 사람을 반환"""
     today = get_kst_now().strftime("%Y-%m-%d")
     try:
-        response = supabase.table("oncall_rotation").select("*").lt("date", today).order("date", desc=True).limit(1).execute()
+        response = transport.get_supabase().table("oncall_rotation").select("*").lt("date", today).order("date", desc=True).limit(1).execute()
         if response.data:
             return response.data[0]["member"]
         return None
@@ -127,7 +92,7 @@ def schedule_monthly_oncall() -> None:
 
     try:
         # Get the last on-call date from the database
-        response = supabase.table("oncall_rotation").select("date, member").order("date", desc=True).limit(1).execute()
+        response = transport.get_supabase().table("oncall_rotation").select("date, member").order("date", desc=True).limit(1).execute()
 
         if not response.data:
             # No existing schedule, create for current month
@@ -179,7 +144,7 @@ def schedule_monthly_oncall() -> None:
         first_day = f"{target_year}-{target_month:02d}-01"
         last_day_str = f"{target_year}-{target_month:02d}-{last_day:02d}"
 
-        existing_schedule = supabase.table("oncall_rotation").select("*").gte("date", first_day).lte("date", last_day_str).execute()
+        existing_schedule = transport.get_supabase().table("oncall_rotation").select("*").gte("date", first_day).lte("date", last_day_str).execute()
 
         if existing_schedule.data:
             print(f"Schedule already exists for {target_year}-{target_month:02d}, skipping")
@@ -188,27 +153,21 @@ def schedule_monthly_oncall() -> None:
         # Create schedule for the entire month
         schedule_data = []
 
-        for day in range(1, last_day + 1):
-            date_str = f"{target_year}-{target_month:02d}-{day:02d}"
-
-            # Skip weekends and holidays
-            check_date = datetime.datetime(target_year, target_month, day)
-            is_weekend = check_date.weekday() >= 5
-            is_holiday = date_str in HOLIDAYS
-
-            if is_weekend or is_holiday:
-                # Assign on-call person for weekends/holidays
-                member = member_list[member_index]
-                schedule_data.append({
-                    "member": member,
-                    "date": date_str
-                })
-                # Move to next member for next assignment
-                member_index = (member_index + 1) % len(member_list)
+        # 주말 / 공휴일만 골라 순서대로 담당자 배정
+        month_start = datetime.date(target_year, target_month, 1)
+        month_end = datetime.date(target_year, target_month, last_day)
+        for check_date in CALENDAR.non_working_days(month_start, month_end):
+            member = member_list[member_index]
+            schedule_data.append({
+                "member": member,
+                "date": check_date.isoformat()
+            })
+            # Move to next member for next assignment
+            member_index = (member_index + 1) % len(member_list)
 
         # Insert all schedule data at once
         if schedule_data:
-            supabase.table("oncall_rotation").insert(schedule_data).execute()
+            transport.get_supabase().table("oncall_rotation").insert(schedule_data).execute()
             print(f"Successfully created on-call schedule for {target_year}-{target_month:02d}: {len(schedule_data)} assignments")
 
             # Log the schedule
@@ -222,18 +181,8 @@ def schedule_monthly_oncall() -> None:
 
 def should_send_reminder() -> bool:
     """Check if we should send a reminder today."""
-    today = get_kst_now()
-    
-    # 주말인지 확인
-    if today.weekday() >= 5:  # 5 is Saturday, 6 is Sunday
-        return True
-    
-    # 공휴일인지 확인
-    today_str = today.strftime("%Y-%m-%d")
-    if today_str in HOLIDAYS:
-        return True
-    
-    return False
+    # 주말이거나 공휴일인지 확인
+    return CALENDAR.is_non_working(get_kst_now().date())
 
 def update_channel_topic(current_oncall: str) -> None:
     """Update the Slack channel topic with current on-call person's information."""
@@ -242,12 +191,7 @@ def update_channel_topic(current_oncall: str) -> None:
         return
 
     # 주말이나 공휴일인지 확인
-    today = get_kst_now()
-    today_str = today.strftime("%Y-%m-%d")
-    is_weekend = today.weekday() >= 5
-    is_holiday = today_str in HOLIDAYS
-
-    if not (is_weekend or is_holiday):
+    if not CALENDAR.is_non_working(get_kst_now().date()):
         # 주중에는 토픽 제거
         topic = ""
     else:
@@ -256,7 +200,7 @@ def update_channel_topic(current_oncall: str) -> None:
         topic = f"현재 온콜 담당자: {current_oncall} ({phone})"
     
     try:
-        response = requests.post(
+        response = transport.post(
             "https://slack.com/api/conversations.setTopic",
             headers={
                 "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
@@ -291,8 +235,8 @@ def send_slack_reminder(current_oncall: str) -> None:
     today_str = today.strftime("%Y-%m-%d")
     
     # 주말이나 공휴일인지 확인
-    is_weekend = today.weekday() >= 5
-    is_holiday = today_str in HOLIDAYS
+    is_weekend = CALENDAR.is_weekend(today.date())
+    is_holiday = CALENDAR.is_holiday(today.date())
     
     # 주말이나 공휴일인지 확인
     if is_weekend and is_holiday:
@@ -332,7 +276,7 @@ def send_slack_reminder(current_oncall: str) -> None:
     print(f"Webhook URL: {SLACK_WEBHOOK_URL[:20]}...")  # 보안을 위해 URL 처음 20자만 출력
     
     try:
-        response = requests.post(
+        response = transport.post(
             SLACK_WEBHOOK_URL,
             data=json.dumps(message),
             headers={"Content-Type": "application/json"}
@@ -349,7 +293,7 @@ def send_slack_reminder(current_oncall: str) -> None:
         print(f"Exception while sending Slack message: {str(e)}")
         print(f"Message that failed to send: {json.dumps(message, indent=2)}")
 
-if __name__ == "__main__":
+def main() -> None:
     print("Starting oncall reminder script...")
     print(f"Current time (KST): {get_kst_now().strftime('%Y-%m-%d %H:%M:%S %Z')}")
     
@@ -365,3 +309,6 @@ if __name__ == "__main__":
     else:
         update_channel_topic(current_oncall)    
     print("Script execution completed.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""상주 스케줄러: 모든 자동화 작업을 한 프로세스에서 주기적으로 실행
+
+작업마다 cron 으로 새 프로세스를 띄우면 실행할 때마다 supabase / bs4 import, .env 로드,
+클라이언트 생성을 반복한다. 스케줄러는 이 비용을 시작할 때 한 번만 내고,
+transport 의 Supabase 클라이언트 / 호스트별 커넥션 풀, 커서 저장소, Slack 큐를 실행 사이에 재사용한다.
+
+사용법:
+    python automation/scheduler.py                       # 상주 실행 (SIGINT / SIGTERM 으로 종료)
+    python automation/scheduler.py --only dcinside,longblack
+    python automation/scheduler.py --run-once dcinside   # 한 작업만 즉시 실행하고 종료
+    python automation/scheduler.py --status              # 실행 중인 스케줄러의 작업별 상태 출력
+
+스케줄 형식 (작업별 환경변수 SCHEDULE_<JOB 대문자> 로 변경):
+    every 60s | every 10m | every 1h     고정 간격 (이전 실행 시작 기준)
+    0 9 * * *                            cron 5필드 (분 시 일 월 요일, 요일 0=일요일), SCHEDULER_TZ 기준
+
+환경변수:
+    SCHEDULER_TZ           cron 해석 시간대 (기본 Asia/Seoul)
+    SCHEDULER_JITTER       다음 실행 시각에 더하는 최대 무작위 지연 초 (기본 10, 간격의 10% 를 넘지 않음)
+    SCHEDULER_STATUS_FILE  작업별 상태를 기록하는 JSON 파일 (기본 .scheduler_status.json)
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import signal
+import sys
+import threading
+import time
+
+import pytz
+from dotenv import load_dotenv
+
+import app_review_scraper
+import dcinside_plabgallery_scraper as dcinside
+import longblack_today_article_scraper as longblack
+import plab_oncall_reminder
+import transport
+
+load_dotenv(".env")
+
+SCHEDULER_TZ = pytz.timezone(os.getenv("SCHEDULER_TZ", "Asia/Seoul"))
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "10"))
+SCHEDULER_STATUS_FILE = os.getenv("SCHEDULER_STATUS_FILE", ".scheduler_status.json")
+
+# 작업 이름 → (기본 스케줄, 실행 함수)
+JOBS = {
+    "plab_oncall_reminder": ("0 9 * * *", plab_oncall_reminder.main),
+    "app_review": ("every 10m", lambda: app_review_scraper.run_all(app_review_scraper.APPS)),
+    "dcinside": ("every 60s", dcinside.main),
+    "longblack": ("*/30 7-12 * * *", longblack.main),
+}
+
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+# cron 필드: (최소값, 최대값)
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def parse_cron_field(field, low, high):
+    """'*/5', '1-5', '0,30', '7-12/2' 형태의 cron 필드 → 허용 값 집합"""
+    values = set()
+    for part in field.split(","):
+        expr, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if expr == "*":
+            start, end = low, high
+        elif "-" in expr:
+            start, end = (int(x) for x in expr.split("-", 1))
+        else:
+            start = end = int(expr)
+            if step > 1:
+                end = high
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"invalid cron field: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSpec:
+    """분 시 일 월 요일 5필드 cron 표현식"""
+
+    def __init__(self, expr, tz=SCHEDULER_TZ):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expr}")
+        self.expr = expr
+        self.tz = tz
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            parse_cron_field(field, low, high) for field, (low, high) in zip(fields, CRON_FIELDS)
+        )
+        self.weekdays = {d % 7 for d in weekdays}  # 7 도 일요일
+        # 일 / 요일이 둘 다 제한되어 있으면 둘 중 하나만 맞아도 실행 (표준 cron 동작)
+        self.any_day = fields[2] != "*" and fields[4] != "*"
+
+    def day_matches(self, d):
+        in_days = d.day in self.days
+        in_weekdays = (d.weekday() + 1) % 7 in self.weekdays
+        return (in_days or in_weekdays) if self.any_day else (in_days and in_weekdays)
+
+    def next_after(self, now):
+        """now(epoch 초) 이후 처음 일치하는 시각(epoch 초)"""
+        t = datetime.datetime.fromtimestamp(now, self.tz).replace(second=0, microsecond=0, tzinfo=None)
+        t += datetime.timedelta(minutes=1)
+        limit = t + datetime.timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months or not self.day_matches(t):
+                t = (t + datetime.timedelta(days=1)).replace(hour=0, minute=0)
+            elif t.hour not in self.hours:
+                t = (t + datetime.timedelta(hours=1)).replace(minute=0)
+            elif t.minute not in self.minutes:
+                t += datetime.timedelta(minutes=1)
+            else:
+                return self.tz.localize(t).timestamp()
+        raise ValueError(f"cron expression never matches: {self.expr}")
+
+    def __str__(self):
+        return self.expr
+
+
+class IntervalSpec:
+    """'every 60s' 같은 고정 간격"""
+
+    def __init__(self, expr):
+        amount = expr.split(None, 1)[1].strip()
+        unit = amount[-1] if amount[-1] in INTERVAL_UNITS else "s"
+        self.seconds = float(amount.rstrip("smh")) * INTERVAL_UNITS[unit]
+        if self.seconds <= 0:
+            raise ValueError(f"invalid interval: {expr}")
+        self.expr = expr
+
+    def next_after(self, now):
+        return now + self.seconds
+
+    def __str__(self):
+        return self.expr
+
+
+def parse_schedule(expr):
+    expr = expr.strip()
+    return IntervalSpec(expr) if expr.startswith("every") else CronSpec(expr)
+
+
+class Job:
+    def __init__(self, name, schedule, fn, jitter=SCHEDULER_JITTER):
+        self.name = name
+        self.schedule = schedule
+        self.fn = fn
+        # 간격이 짧은 작업은 지연도 간격의 10% 안으로 제한
+        interval = getattr(schedule, "seconds", None)
+        self.jitter = min(jitter, interval * 0.1) if interval else jitter
+        self.next_run = None
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_started = None
+        self.last_duration = None
+        self.last_ok = None
+        self.last_error = None
+
+    def plan(self, now):
+        self.next_run = self.schedule.next_after(now) + random.uniform(0, self.jitter)
+
+    def run(self):
+        started = time.perf_counter()
+        self.last_started = time.time()
+        try:
+            self.fn()
+            self.last_ok, self.last_error = True, None
+        except SystemExit as e:
+            # 기존 스크립트의 sys.exit(1) 은 실패로만 기록하고 스케줄러는 계속 실행
+            self.last_ok = not e.code
+            self.last_error = None if self.last_ok else f"exit {e.code}"
+        except Exception as e:
+            self.last_ok, self.last_error = False, repr(e)
+        self.last_duration = time.perf_counter() - started
+        self.runs += 1
+        if not self.last_ok:
+            self.failures += 1
+            print(f"❌ [{self.name}] {self.last_error}", file=sys.stderr)
+
+    def status(self):
+        return {
+            "schedule": str(self.schedule),
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_started": format_time(self.last_started),
+            "last_duration": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "last_ok": self.last_ok,
+            "last_error": self.last_error,
+            "next_run": format_time(self.next_run),
+        }
+
+
+def format_time(ts):
+    if ts is None:
+        return None
+    return datetime.datetime.fromtimestamp(ts, SCHEDULER_TZ).isoformat(timespec="seconds")
+
+
+class Scheduler:
+    """작업마다 다음 실행 시각을 계산해 때가 되면 별도 스레드에서 실행
+
+    같은 작업의 이전 실행이 아직 끝나지 않았으면 이번 차례는 건너뛴다 (중복 실행 방지).
+    """
+
+    def __init__(self, jobs, status_file=SCHEDULER_STATUS_FILE):
+        self.jobs = jobs
+        self.status_file = status_file
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = {}
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def start_job(self, job):
+        with self._lock:
+            job.running = True
+        thread = threading.Thread(target=self._run_job, args=(job,), name=f"job-{job.name}", daemon=True)
+        self._threads[job.name] = thread
+        thread.start()
+
+    def _run_job(self, job):
+        print(f"▶️ [{job.name}] 시작")
+        job.run()
+        with self._lock:
+            job.running = False
+        print(f"⏱️ [{job.name}] {job.last_duration:.2f}s {'✅' if job.last_ok else '❌'} "
+              f"(다음 실행 {format_time(job.next_run)})")
+        self.write_status()
+
+    def tick(self, now):
+        for job in self.jobs:
+            if job.next_run > now:
+                continue
+            if job.running:
+                job.skipped += 1
+                print(f"⏭️ [{job.name}] 이전 실행이 아직 끝나지 않아 건너뜀", file=sys.stderr)
+            else:
+                self.start_job(job)
+            job.plan(now)
+        self.write_status()
+
+    def run_forever(self):
+        now = time.time()
+        for job in self.jobs:
+            job.plan(now)
+            print(f"🗓️ [{job.name}] {job.schedule} → 다음 실행 {format_time(job.next_run)}")
+        self.write_status()
+
+        while not self._stop.is_set():
+            now = time.time()
+            self.tick(now)
+            wait = min(job.next_run for job in self.jobs) - time.time()
+            self._stop.wait(max(0.0, wait))
+
+        print("🛑 스케줄러 종료 중... 실행 중인 작업을 기다립니다.")
+        for thread in self._threads.values():
+            thread.join()
+        self.write_status()
+        transport.close_all()
+
+    def write_status(self):
+        with self._lock:
+            status = {
+                "updated_at": format_time(time.time()),
+                "pid": os.getpid(),
+                "jobs": {job.name: job.status() for job in self.jobs},
+            }
+        tmp_path = f"{self.status_file}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(status, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.status_file)
+        except OSError as e:
+            print(f"Error writing scheduler status: {e}", file=sys.stderr)
+
+
+def build_jobs(names=None):
+    jobs = []
+    for name, (default_schedule, fn) in JOBS.items():
+        if names and name not in names:
+            continue
+        schedule = parse_schedule(os.getenv(f"SCHEDULE_{name.upper()}", default_schedule))
+        jobs.append(Job(name, schedule, fn))
+    return jobs
+
+
+def print_status(status_file=SCHEDULER_STATUS_FILE):
+    try:
+        with open(status_file, encoding="utf-8") as f:
+            status = json.load(f)
+    except FileNotFoundError:
+        print(f"⚠️ 상태 파일이 없습니다: {status_file}")
+        return
+    print(f"스케줄러 pid={status['pid']} (갱신 {status['updated_at']})")
+    for name, job in status["jobs"].items():
+        duration = f"{job['last_duration']:.2f}s" if job["last_duration"] is not None else "-"
+        state = "실행 중" if job["running"] else ("✅" if job["last_ok"] else "-" if job["last_ok"] is None else "❌")
+        print(f"  {name:<22} {job['schedule']:<16} 최근 {duration:>8} {state:<4} "
+              f"다음 {job['next_run']}  (runs={job['runs']} failures={job['failures']} skipped={job['skipped']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="자동화 작업 상주 스케줄러")
+    parser.add_argument("--only", help=f"실행할 작업 (쉼표 구분: {', '.join(JOBS)})")
+    parser.add_argument("--run-once", metavar="JOB", help="지정한 작업을 한 번 실행하고 종료")
+    parser.add_argument("--status", action="store_true", help="상태 파일의 작업별 최근 실행 / 다음 실행 출력")
+    args = parser.parse_args()
+
+    if args.status:
+        print_status()
+        return
+    if args.run_once:
+        if args.run_once not in JOBS:
+            parser.error(f"알 수 없는 작업: {args.run_once}")
+        job, = build_jobs({args.run_once})
+        job.run()
+        print(f"⏱️ [{job.name}] {job.last_duration:.2f}s {'✅' if job.last_ok else '❌ ' + str(job.last_error)}")
+        sys.exit(0 if job.last_ok else 1)
+
+    jobs = build_jobs(set(args.only.split(",")) if args.only else None)
+    if not jobs:
+        parser.error("실행할 작업이 없습니다")
+    scheduler = Scheduler(jobs)
+    signal.signal(signal.SIGINT, scheduler.stop)
+    signal.signal(signal.SIGTERM, scheduler.stop)
+    scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""모든 스크래퍼(앱 리뷰, DCInside, Longblack)를 하나의 이벤트 루프에서 동시에 실행
+
+사용법:
+    python automation/scrape_all.py [--only app_review,dcinside,longblack]
+
+AsyncEngine 하나가 HTTP 연결 풀과 executor 를 공유하고, TaskGraph 로 작업 순서를 정한다.
+  - 앱마다 google_play / app_store 수집 → 둘 다 끝나면 해당 앱 outbox 발송
+  - dcinside, longblack 은 독립 작업
+한 작업이 실패해도 나머지는 계속 실행되며, 실패한 작업이 있으면 종료 코드 1 로 끝난다.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from urllib.parse import urlparse
+
+import app_review_scraper
+import dcinside_plabgallery_scraper as dcinside
+import longblack_today_article_scraper as longblack
+from async_engine import AsyncEngine, TaskGraph
+
+SOURCES = ("app_review", "dcinside", "longblack")
+
+
+def host_limits():
+    """각 스크래퍼의 기존 동시 요청 제한을 엔진의 호스트별 제한으로 옮김"""
+    return {
+        urlparse(dcinside.DC_GALLERY_URL).netloc: dcinside.DC_MAX_IN_FLIGHT,
+        urlparse(app_review_scraper.APP_STORE_RSS_BASE_URL).netloc: app_review_scraper.APP_STORE_CONCURRENCY,
+        "play.google.com": app_review_scraper.PLAY_STORE_CONCURRENCY,
+        "supabase": app_review_scraper.SUPABASE_CONCURRENCY,
+    }
+
+
+def build_graph(engine, apps, sources=SOURCES):
+    graph = TaskGraph()
+    if "dcinside" in sources:
+        graph.add("dcinside", lambda: dcinside.main_async(engine))
+    if "longblack" in sources:
+        graph.add("longblack", lambda: longblack.main_async(engine))
+    if "app_review" in sources:
+        for app_key, app_config in apps.items():
+            scraper = app_review_scraper.AppReviewScraper(**app_config)
+            graph.add(f"{app_key}:google_play", lambda s=scraper: s.process_google_play_async(engine))
+            graph.add(f"{app_key}:app_store", lambda s=scraper: s.process_app_store_async(engine))
+            # 한쪽 수집이 실패해도 저장된 리뷰는 보내도록 끝나기만 기다림
+            graph.add(
+                f"{app_key}:notify", lambda s=scraper: engine.run_sync(s.drain_notifications),
+                deps=[f"{app_key}:google_play", f"{app_key}:app_store"], require_success=False
+            )
+    return graph
+
+
+async def run(apps, sources=SOURCES):
+    async with AsyncEngine(host_limits()) as engine:
+        return await build_graph(engine, apps, sources).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모든 스크래퍼를 하나의 이벤트 루프에서 실행")
+    parser.add_argument("--only", help=f"실행할 소스 (쉼표 구분: {', '.join(SOURCES)})")
+    args = parser.parse_args()
+    sources = tuple(args.only.split(",")) if args.only else SOURCES
+
+    started = time.perf_counter()
+    results = asyncio.run(run(app_review_scraper.APPS, sources))
+
+    print(f"\n⏱️ 실행 요약 (총 {time.perf_counter() - started:.2f}s)")
+    for name, result in results.items():
+        status = "✅" if result['ok'] else f"❌ {result['error']}"
+        print(f"  {name:<24} {result['elapsed']:6.2f}s {status}")
+    sys.exit(0 if all(result['ok'] for result in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Slack Incoming Webhook 발송 큐
+
+알림을 webhook 별로 모아 두었다가 flush() 때 Block Kit 메시지 하나에 여러 건씩 합쳐 보낸다.
+  - 메시지 하나는 최대 SLACK_MAX_BLOCKS 블록 / SLACK_MAX_ITEMS 건
+  - webhook 마다 초당 SLACK_MESSAGES_PER_SECOND 개로 제한 (SLACK_BURST 개까지 순간 허용)
+  - 429 는 Retry-After 만큼 기다린 뒤, 5xx / 연결 오류는 지수 backoff 후 재시도
+  - 서로 다른 webhook 은 병렬로 발송
+  - 합친 메시지가 4xx 로 거절되면 한 건씩 나눠 다시 보내 문제 있는 알림만 실패 처리
+
+환경변수:
+    SLACK_MAX_ITEMS            메시지 하나에 합칠 최대 알림 수 (기본 10)
+    SLACK_MESSAGES_PER_SECOND  webhook 별 초당 메시지 수 (기본 1)
+    SLACK_BURST                webhook 별 순간 허용 메시지 수 (기본 3)
+    SLACK_MAX_RETRIES          메시지당 재시도 횟수 (기본 5)
+    SLACK_MAX_WORKERS          동시에 발송할 webhook 수 (기본 4)
+"""
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import transport
+from concurrency import TokenBucket
+
+# Slack 제한: 메시지당 블록 수 / section 텍스트 길이
+SLACK_MAX_BLOCKS = 50
+SLACK_MAX_TEXT = 3000
+
+SLACK_MAX_ITEMS = int(os.getenv("SLACK_MAX_ITEMS", "10"))
+SLACK_MESSAGES_PER_SECOND = float(os.getenv("SLACK_MESSAGES_PER_SECOND", "1"))
+SLACK_BURST = int(os.getenv("SLACK_BURST", "3"))
+SLACK_MAX_RETRIES = int(os.getenv("SLACK_MAX_RETRIES", "5"))
+SLACK_MAX_WORKERS = int(os.getenv("SLACK_MAX_WORKERS", "4"))
+
+RETRY_BACKOFF = 0.5
+MAX_RETRY_WAIT = 60
+
+SENT, REJECTED, FAILED = "sent", "rejected", "failed"
+
+
+def section(text):
+    """mrkdwn section 블록 (Slack 길이 제한에 맞춰 자름)"""
+    if text and len(text) > SLACK_MAX_TEXT:
+        text = text[:SLACK_MAX_TEXT - 3] + "..."
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text or " "}}
+
+
+def retry_after(response, default=1.0):
+    try:
+        return float(response.headers.get("Retry-After", default))
+    except (TypeError, ValueError):
+        return default
+
+
+class SlackQueue:
+    def __init__(self, max_items=SLACK_MAX_ITEMS, rate=SLACK_MESSAGES_PER_SECOND, burst=SLACK_BURST,
+                 max_retries=SLACK_MAX_RETRIES, max_workers=SLACK_MAX_WORKERS):
+        self.max_items = max(1, max_items)
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.max_workers = max_workers
+        self._pending = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, webhook_url, blocks, text, key=None):
+        """알림 한 건을 webhook 별 대기열에 추가 (key 는 flush 결과에서 성공/실패 구분용)"""
+        with self._lock:
+            self._pending.setdefault(webhook_url or "", []).append({"key": key, "blocks": blocks, "text": text})
+
+    def pending_count(self):
+        with self._lock:
+            return sum(len(items) for items in self._pending.values())
+
+    def _bucket(self, webhook_url):
+        with self._lock:
+            if webhook_url not in self._buckets:
+                self._buckets[webhook_url] = TokenBucket(self.rate, capacity=max(1, self.burst))
+            return self._buckets[webhook_url]
+
+    def batches(self, items):
+        """순서를 유지하며 블록 수 / 건수 제한 안에서 묶음"""
+        batch, blocks = [], 0
+        for item in items:
+            size = len(item["blocks"])
+            if batch and (len(batch) >= self.max_items or blocks + size > SLACK_MAX_BLOCKS):
+                yield batch
+                batch, blocks = [], 0
+            batch.append(item)
+            blocks += size
+        if batch:
+            yield batch
+
+    def post(self, webhook_url, batch, stats):
+        """메시지 하나 발송 → SENT / REJECTED(재시도해도 안 되는 4xx) / FAILED(재시도 소진)"""
+        text = batch[0]["text"] if len(batch) == 1 else f"{batch[0]['text']} 외 {len(batch) - 1}건"
+        payload = json.dumps({
+            "text": text,
+            "blocks": [block for item in batch for block in item["blocks"]],
+        }, ensure_ascii=False).encode("utf-8")
+
+        bucket = self._bucket(webhook_url)
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            try:
+                response = transport.post(
+                    webhook_url, data=payload, headers={"Content-Type": "application/json; charset=utf-8"}
+                )
+            except Exception as e:
+                reason, wait = repr(e), RETRY_BACKOFF * 2 ** attempt
+            else:
+                if response.status_code < 300:
+                    stats["messages"] += 1
+                    return SENT
+                reason = f"{response.status_code} {response.text[:200]}"
+                if response.status_code == 429:
+                    stats["rate_limited"] += 1
+                    wait = retry_after(response)
+                elif response.status_code >= 500:
+                    wait = RETRY_BACKOFF * 2 ** attempt
+                else:
+                    print(f"❌ Slack 메시지 거절 ({len(batch)}건): {reason}", file=sys.stderr)
+                    return REJECTED
+            if attempt < self.max_retries:
+                stats["retries"] += 1
+                time.sleep(min(wait, MAX_RETRY_WAIT))
+        print(f"❌ Slack 발송 실패 ({len(batch)}건, 재시도 {self.max_retries}회 소진): {reason}", file=sys.stderr)
+        return FAILED
+
+    def drain(self, webhook_url, items):
+        """한 webhook 의 대기열을 순서대로 발송"""
+        stats = {"messages": 0, "retries": 0, "rate_limited": 0, "delivered": [], "failed": [], "rejected": []}
+        if not webhook_url:
+            print(f"⚠️ Slack webhook 이 설정되지 않아 {len(items)}건을 보내지 못했습니다.", file=sys.stderr)
+            stats["failed"] = [item["key"] for item in items]
+            return stats
+
+        for batch in self.batches(items):
+            result = self.post(webhook_url, batch, stats)
+            if result == REJECTED and len(batch) > 1:
+                # 어떤 알림 때문에 거절됐는지 모르므로 한 건씩 다시 보냄
+                for item in batch:
+                    single = self.post(webhook_url, [item], stats)
+                    stats["delivered" if single == SENT else "failed"].append(item["key"])
+                    if single == REJECTED:
+                        stats["rejected"].append(item["key"])
+                continue
+            stats["delivered" if result == SENT else "failed"].extend(item["key"] for item in batch)
+            if result == REJECTED:
+                stats["rejected"].extend(item["key"] for item in batch)
+        return stats
+
+    def flush(self):
+        """대기 중인 알림을 모두 발송하고 결과를 반환
+
+        반환값: {'items', 'messages', 'retries', 'rate_limited', 'delivered': [key], 'failed': [key],
+                 'rejected': [key] (failed 중 4xx 로 거절되어 다시 보내도 안 되는 알림), 'elapsed'}
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        started = time.perf_counter()
+        total = {"items": sum(len(items) for items in pending.values()),
+                 "messages": 0, "retries": 0, "rate_limited": 0, "delivered": [], "failed": [], "rejected": []}
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(pending)))) as executor:
+                for stats in executor.map(lambda entry: self.drain(*entry), pending.items()):
+                    for name in ("messages", "retries", "rate_limited"):
+                        total[name] += stats[name]
+                    total["delivered"].extend(stats["delivered"])
+                    total["failed"].extend(stats["failed"])
+                    total["rejected"].extend(stats["rejected"])
+        total["elapsed"] = time.perf_counter() - started
+        return total
+
+
+def format_stats(result):
+    elapsed = result["elapsed"]
+    rate = f", {len(result['delivered']) / elapsed:.1f}건/s" if elapsed > 0 and result["delivered"] else ""
+    return (
+        f"📨 Slack {result['items']}건 → 메시지 {result['messages']}개 "
+        f"(재시도 {result['retries']}, 429 {result['rate_limited']}, 실패 {len(result['failed'])}) "
+        f"{elapsed:.2f}s{rate}"
+    )
@@ -0,0 +1,96 @@
+"""프로세스 전역에서 공유하는 Supabase 클라이언트와 호스트별 HTTP 세션
+
+모든 스크립트는 create_client / requests.get / requests.post 를 직접 호출하지 않고
+여기의 get_supabase(), get(), post() 를 사용한다.
+
+환경변수:
+    HTTP_POOL_SIZE  호스트별 keep-alive 커넥션 풀 크기 (기본 10)
+    HTTP_TIMEOUT    요청 타임아웃 초 (기본 10)
+    HTTP_RETRIES    연결 실패 / 429 / 5xx 재시도 횟수 (기본 3)
+    HTTP_BACKOFF    재시도 backoff factor (기본 0.5)
+"""
+import os
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_lock = threading.Lock()
+_supabase = None
+_sessions = {}
+
+
+def get_supabase():
+    """프로세스당 하나의 Supabase 클라이언트를 처음 사용할 때 생성해 반환"""
+    global _supabase
+    if _supabase is None:
+        with _lock:
+            if _supabase is None:
+                from supabase import create_client
+                _supabase = create_client(
+                    os.getenv("SUPABASE_URL", ""),
+                    os.getenv("SUPABASE_KEY", "")
+                )
+    return _supabase
+
+
+def set_supabase(client):
+    """공유 Supabase 클라이언트를 교체 (테스트용 가짜 클라이언트 주입 등)"""
+    global _supabase
+    with _lock:
+        _supabase = client
+
+
+def _build_session(pool_size, retries, backoff):
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(url, pool_size=None, retries=None, backoff=None):
+    """URL의 호스트에 대한 keep-alive 세션을 반환 (호스트별로 하나씩 재사용)"""
+    host = urlparse(url).netloc or url
+    session = _sessions.get(host)
+    if session is None:
+        with _lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = _build_session(
+                    pool_size or int(os.getenv("HTTP_POOL_SIZE", "10")),
+                    int(os.getenv("HTTP_RETRIES", "3")) if retries is None else retries,
+                    float(os.getenv("HTTP_BACKOFF", "0.5")) if backoff is None else backoff,
+                )
+                _sessions[host] = session
+    return session
+
+
+def request(method, url, **kwargs):
+    kwargs.setdefault("timeout", float(os.getenv("HTTP_TIMEOUT", "10")))
+    return get_session(url).request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def close_all():
+    """열려 있는 모든 HTTP 세션을 닫음"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,115 @@
+"""Vercel API 핸들러 콜드 스타트 측정
+
+사용법:
+    python benchmarks/api_cold_start.py [--budget-ms 300] [--top 8]
+
+핸들러마다 새 파이썬 프로세스에서
+  1) `-X importtime` 으로 모듈 import 시간과 가장 무거운 import 목록
+  2) 프로세스 시작 → 첫 GET(헬스체크) 응답까지의 시간과 이어지는 첫 POST 응답 시간
+을 측정하고 예산(--budget-ms)을 넘으면 표시한다. 외부 네트워크에는 접속하지 않는다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api")
+
+# 모듈 → (첫 POST 본문, 해당 POST가 타는 경로)
+HANDLERS = {
+    "oncall": ("command=/온콜리스트", "DB 경로 (supabase lazy import 포함, DB는 접속 불가)"),
+    "swap_oncall": ("command=/온콜바꿔&text=", "사용법 오류 경로"),
+}
+
+# 자식 프로세스: 시작 시각부터 모듈 import, 로컬 서버 기동, 첫 요청 응답까지 시간 측정
+FIRST_REQUEST_PROBE = r"""
+import time
+started = time.perf_counter()
+import http.client, json, sys, threading
+from http.server import HTTPServer
+module = __import__(sys.argv[1])
+imported = time.perf_counter()
+
+server = HTTPServer(("127.0.0.1", 0), module.handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+def request(method, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port)
+    headers = {"Content-Type": "application/x-www-form-urlencoded"} if body else {}
+    conn.request(method, "/", body=body.encode() if body else None, headers=headers)
+    conn.getresponse().read()
+    conn.close()
+    return time.perf_counter()
+
+first_get = request("GET")
+first_post = request("POST", sys.argv[2])
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_get_ms": (first_get - started) * 1000,
+    "first_post_ms": (first_post - first_get) * 1000,
+    "heavy_loaded": sorted(m for m in ("supabase", "requests", "pytz", "httpx") if m in sys.modules),
+}))
+"""
+
+
+def run(args, env):
+    return subprocess.run(
+        [sys.executable, *args], cwd=API_DIR, env=env,
+        capture_output=True, text=True, check=True
+    )
+
+
+def import_profile(module, env, top):
+    """-X importtime 출력에서 모듈 전체 import 시간과 누적 시간이 큰 import 목록을 추출"""
+    stderr = run(["-X", "importtime", "-c", f"import {module}"], env).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    # importtime 은 자식 모듈을 부모보다 먼저 출력하므로, 핸들러 모듈 행 바로 앞의 depth 1 행들이 직접 import 한 모듈
+    index = next(i for i, row in enumerate(rows) if row[2] == 0 and row[3] == module)
+    children = []
+    for cumulative, _, depth, name in reversed(rows[:index]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((cumulative, name))
+    total = rows[index][0]
+    heaviest = sorted(children, reverse=True)
+    return total, heaviest[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=300, help="첫 응답까지 허용 시간 (ms)")
+    parser.add_argument("--top", type=int, default=8, help="표시할 무거운 import 개수")
+    args = parser.parse_args()
+
+    # 실제 접속은 하지 않지만 모듈이 환경변수를 읽을 수 있게 더미 값을 넣음
+    env = dict(os.environ, SUPABASE_URL="http://127.0.0.1:9", SUPABASE_KEY="cold-start-probe")
+
+    over_budget = False
+    for module, (post_body, post_path) in HANDLERS.items():
+        total_us, heaviest = import_profile(module, env, args.top)
+        probe = json.loads(run(["-c", FIRST_REQUEST_PROBE, module, post_body], env).stdout.strip().splitlines()[-1])
+
+        print(f"\n== {module}")
+        print(f"  import (-X importtime) : {total_us / 1000:8.1f} ms")
+        for cumulative_us, name in heaviest:
+            print(f"    {name:<28} {cumulative_us / 1000:8.1f} ms")
+        print(f"  process start → first GET     : {probe['first_get_ms']:8.1f} ms")
+        print(f"  first POST                    : {probe['first_post_ms']:8.1f} ms  ({post_path})")
+        print(f"  heavy modules after requests  : {', '.join(probe['heavy_loaded']) or '-'}")
+        if probe["first_get_ms"] > args.budget_ms:
+            over_budget = True
+            print(f"  ⚠️ 예산 초과 ({args.budget_ms:.0f} ms)")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
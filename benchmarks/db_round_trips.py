@@ -0,0 +1,178 @@
+"""스크래퍼 DB 경로별 Supabase 왕복 횟수 비교 (네트워크 없이 로컬에서 실행)
+
+사용법:
+    python benchmarks/db_round_trips.py [--items 100] [--existing-ratio 0.5] [--db-latency 0.02] [--jitter 0.01]
+
+automation/ 스크립트의 공유 클라이언트를 transport.set_supabase() 로 인메모리 대역(fake_supabase)으로 바꾸고,
+같은 입력에 대해 건별(unbatched) 경로와 일괄(batched) 경로를 각각 실행해
+  - execute() 왕복 횟수 (테이블/작업별)
+  - 지연 주입 시 걸린 시간
+  - 두 경로가 남긴 DB 상태가 같은지
+를 출력한다.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "automation"))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "round-trip-bench")
+
+import transport  # noqa: E402
+from fake_supabase import FakeSupabase  # noqa: E402
+
+REVIEW_TABLE = "plab_review"
+
+
+def review_rows(count):
+    return [
+        {
+            "platform_type": "google_play",
+            "user_name": f"user{i}",
+            "rating": i % 5 + 1,
+            "review": f"리뷰 {i}",
+            "created_at": f"2026-10-{17 - i // 100:02d}T{23 - i % 24:02d}:00:00",
+            "platform_review_id": f"gp-{i:05d}",
+        }
+        for i in range(count)
+    ]
+
+
+def review_exists(scraper, review_id, platform_type):
+    """이전 방식: 리뷰 한 건의 저장 여부를 조회"""
+    result = scraper.supabase.table(scraper.table_name) \
+        .select("platform_review_id") \
+        .eq("platform_review_id", review_id) \
+        .eq("platform_type", platform_type) \
+        .execute()
+    return len(result.data) > 0
+
+
+def app_review_unbatched(scraper, candidates):
+    """리뷰마다 review_exists → insert"""
+    for row in candidates:
+        if not review_exists(scraper, row["platform_review_id"], row["platform_type"]):
+            scraper.supabase.table(scraper.table_name).insert(
+                scraper.build_review_row(
+                    row["platform_review_id"], row["platform_type"], row["user_name"],
+                    row["rating"], row["review"], row["created_at"]
+                )
+            ).execute()
+
+
+def app_review_batched(scraper, candidates):
+    """in_ 한 번으로 dedup → bulk insert 한 번"""
+    _, rows = scraper.select_new_reviews(candidates, "google_play", None)
+    scraper.save_reviews_to_supabase(rows)
+
+
+def dc_posts(count):
+    return [
+        {
+            "post_id": 100000 + i,
+            "url": f"https://gall.dcinside.com/mgallery/board/view/?id=plabfootball&no={100000 + i}",
+            "title": f"게시글 {i}",
+            "author": "ㅇㅇ",
+            "date": "2026-10-17",
+            "content": "본문",
+        }
+        for i in range(count)
+    ]
+
+
+def dcinside_unbatched(dc, posts):
+    """게시글마다 is_post_exists → save_post"""
+    for post in posts:
+        if not dc.is_post_exists(post["post_id"]):
+            dc.save_post(dict(post))
+
+
+def dcinside_batched(dc, posts):
+    """get_existing_post_ids 한 번 → 새 게시글만 save_post"""
+    existing = dc.get_existing_post_ids([post["post_id"] for post in posts])
+    for post in posts:
+        if post["post_id"] not in existing:
+            dc.save_post(dict(post))
+
+
+def snapshot(fake, table_name, key):
+    return sorted(str(row[key]) for row in fake.tables.get(table_name, []))
+
+
+def run_variant(fn, seed_fn, args, table_name, key):
+    fake = FakeSupabase(latency=args.db_latency, jitter=args.jitter, seed=args.seed)
+    seed_fn(fake)
+    transport.set_supabase(fake)
+    fake.reset_stats()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        fn()
+    elapsed = time.perf_counter() - started
+    return fake.round_trips, dict(fake.stats), elapsed, snapshot(fake, table_name, key)
+
+
+def report(scenario, variants):
+    print(f"\n== {scenario}")
+    states = set()
+    for name, (round_trips, stats, elapsed, state) in variants.items():
+        breakdown = ", ".join(f"{op}={n}" for op, n in sorted(stats.items()))
+        print(f"  {name:<10} round-trips={round_trips:<5} {elapsed * 1000:9.1f} ms  ({breakdown})")
+        states.add(tuple(state))
+    print(f"  결과 DB 상태 일치: {'✅' if len(states) == 1 else '❌'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100, help="입력 리뷰/게시글 수")
+    parser.add_argument("--existing-ratio", type=float, default=0.5, help="이미 DB에 있는 비율")
+    parser.add_argument("--db-latency", type=float, default=0.02, help="Supabase 요청당 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="요청당 추가 지연 상한 (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    existing_count = int(args.items * args.existing_ratio)
+
+    import app_review_scraper
+    import dcinside_plabgallery_scraper as dc
+
+    candidates = review_rows(args.items)
+
+    def seed_reviews(fake):
+        fake.add_unique(REVIEW_TABLE, "platform_type", "platform_review_id")
+        # 최신순 후보 중 뒤쪽(오래된) 리뷰들이 이미 저장되어 있는 상황
+        fake.seed(REVIEW_TABLE, candidates[args.items - existing_count:])
+
+    def scraper():
+        return app_review_scraper.AppReviewScraper(
+            app_name="bench", table_name=REVIEW_TABLE, slack_webhook_url="",
+            google_package_name="bench", apple_app_id=None
+        )
+
+    report(f"app_review_scraper: 후보 {args.items}개 중 {existing_count}개 기존", {
+        "unbatched": run_variant(lambda: app_review_unbatched(scraper(), candidates),
+                                 seed_reviews, args, REVIEW_TABLE, "platform_review_id"),
+        "batched": run_variant(lambda: app_review_batched(scraper(), candidates),
+                               seed_reviews, args, REVIEW_TABLE, "platform_review_id"),
+    })
+
+    posts = dc_posts(args.items)
+
+    def seed_posts(fake):
+        fake.add_unique("dc_posts", "post_id")
+        fake.seed("dc_posts", posts[:existing_count])
+
+    report(f"dcinside_plabgallery_scraper: 게시글 {args.items}개 중 {existing_count}개 기존", {
+        "unbatched": run_variant(lambda: dcinside_unbatched(dc, posts), seed_posts, args, "dc_posts", "post_id"),
+        "batched": run_variant(lambda: dcinside_batched(dc, posts), seed_posts, args, "dc_posts", "post_id"),
+    })
+
+    transport.set_supabase(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""오프라인 벤치마크용 인메모리 Supabase(PostgREST) 대역
+
+create_client() 가 돌려주는 클라이언트 대신 주입해서 사용한다.
+    fake = FakeSupabase(latency=0.02, jitter=0.01)
+    fake.seed("oncall_rotation", rows)
+    oncall.supabase = fake              # api/ 핸들러
+    transport.set_supabase(fake)        # automation/ 스크립트
+
+지원하는 쿼리 빌더:
+    select(columns, count='exact', head=True) / insert / update / upsert(on_conflict, ignore_duplicates) / delete / rpc
+    eq / neq / gt / gte / lt / lte / in_ / order / limit
+모든 execute() 는 latency(+0~jitter) 초만큼 지연된 뒤 하나의 잠금 안에서 실행된다 (요청 단위 트랜잭션).
+execute() 한 번이 PostgREST 왕복 한 번이며, 테이블/작업별 횟수가 fake.stats 에 쌓인다.
+"""
+import collections
+import copy
+import random
+import threading
+import time
+
+
+class FakeAPIError(Exception):
+    """postgrest.exceptions.APIError 처럼 code 속성을 가진 오류"""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def _same(a, b):
+    return a == b or str(a) == str(b)
+
+
+class FakeQuery:
+    def __init__(self, client, table_name):
+        self.client = client
+        self.table_name = table_name
+        self.operation = "select"
+        self.columns = "*"
+        self.payload = None
+        self.on_conflict = "id"
+        self.ignore_duplicates = False
+        self.filters = []
+        self.orders = []
+        self.limit_count = None
+        self.count_mode = None
+        self.head = False
+
+    # --- 작업 종류 ---
+    def select(self, *columns, count=None, head=False, **kwargs):
+        self.operation = "select"
+        self.columns = ",".join(columns) or "*"
+        self.count_mode = count
+        self.head = head
+        return self
+
+    def insert(self, values, count=None, **kwargs):
+        self.operation = "insert"
+        self.payload = values
+        self.count_mode = count
+        return self
+
+    def update(self, values, count=None, **kwargs):
+        self.operation = "update"
+        self.payload = values
+        self.count_mode = count
+        return self
+
+    def upsert(self, values, on_conflict="id", count=None, ignore_duplicates=False, **kwargs):
+        self.operation = "upsert"
+        self.payload = values
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        self.count_mode = count
+        return self
+
+    def delete(self, count=None, **kwargs):
+        self.operation = "delete"
+        self.count_mode = count
+        return self
+
+    # --- 필터 / 정렬 ---
+    def eq(self, column, value):
+        self.filters.append(lambda row: _same(row.get(column), value))
+        return self
+
+    def neq(self, column, value):
+        self.filters.append(lambda row: not _same(row.get(column), value))
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) > value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) >= value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) < value)
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) <= value)
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self.filters.append(lambda row: any(_same(row.get(column), v) for v in values))
+        return self
+
+    def order(self, column, desc=False, **kwargs):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, count, **kwargs):
+        self.limit_count = count
+        return self
+
+    # --- 실행 ---
+    def _matches(self, row):
+        return all(f(row) for f in self.filters)
+
+    def _project(self, row):
+        if self.columns.strip() == "*":
+            return dict(row)
+        return {c.strip(): row.get(c.strip()) for c in self.columns.split(",")}
+
+    def _response(self, data, total=None):
+        """count 를 요청한 경우에만 count 를 채우고, head=True 면 data 없이 count 만 반환"""
+        count = (len(data) if total is None else total) if self.count_mode else None
+        return FakeResponse([] if self.head else data, count)
+
+    def _write(self, rows, record):
+        record = copy.deepcopy(record)
+        self.client._check_unique(self.table_name, rows, record)
+        return dict(self.client._append(self.table_name, record))
+
+    def _run(self, rows):
+        if self.operation == "select":
+            matched = [row for row in rows if self._matches(row)]
+            total = len(matched)
+            for column, desc in reversed(self.orders):
+                matched.sort(key=lambda row: row.get(column), reverse=desc)
+            if self.limit_count is not None:
+                matched = matched[:self.limit_count]
+            return self._response([self._project(row) for row in matched], total)
+
+        if self.operation == "insert":
+            records = self.payload if isinstance(self.payload, list) else [self.payload]
+            # 한 요청 안에서는 전부 성공하거나 전부 실패 (PostgREST bulk insert 와 동일)
+            staged = list(rows)
+            for record in records:
+                self.client._check_unique(self.table_name, staged, record)
+                staged.append(record)
+            return self._response([self._write(rows, record) for record in records])
+
+        if self.operation == "update":
+            updated = []
+            for row in rows:
+                if self._matches(row):
+                    row.update(copy.deepcopy(self.payload))
+                    updated.append(dict(row))
+            return self._response(updated)
+
+        if self.operation == "delete":
+            removed = [row for row in rows if self._matches(row)]
+            rows[:] = [row for row in rows if not self._matches(row)]
+            return self._response(removed)
+
+        if self.operation == "upsert":
+            records = self.payload if isinstance(self.payload, list) else [self.payload]
+            keys = [k.strip() for k in self.on_conflict.split(",")]
+            written = []
+            for record in records:
+                existing = next((row for row in rows if all(_same(row.get(k), record.get(k)) for k in keys)), None)
+                if existing is not None and self.ignore_duplicates:
+                    continue
+                if existing is not None:
+                    existing.update(copy.deepcopy(record))
+                    written.append(dict(existing))
+                else:
+                    written.append(self._write(rows, record))
+            return self._response(written)
+
+        raise FakeAPIError(f"unsupported operation {self.operation}")
+
+    def execute(self):
+        self.client._round_trip(f"{self.table_name}.{self.operation}")
+        with self.client.lock:
+            return self._run(self.client.tables.setdefault(self.table_name, []))
+
+
+class FakeRpc:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        self.client._round_trip(f"rpc.{self.name}")
+        fn = self.client.functions.get(self.name)
+        if fn is None:
+            raise FakeAPIError(f"Could not find the function public.{self.name}", code="PGRST202")
+        with self.client.lock:
+            return FakeResponse(fn(self.client.tables, **self.params))
+
+
+class FakeSupabase:
+    def __init__(self, latency=0.0, jitter=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.tables = {}
+        self.functions = {}
+        self.unique_keys = {}
+        self.stats = collections.Counter()
+        self.lock = threading.RLock()
+        self._rng = random.Random(seed)
+        self._next_ids = {}
+
+    def _round_trip(self, name):
+        with self.lock:
+            self.stats[name] += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+    def _check_unique(self, table_name, rows, record):
+        for columns in self.unique_keys.get(table_name, []):
+            if all(record.get(c) is not None for c in columns) and any(
+                all(_same(row.get(c), record.get(c)) for c in columns) for row in rows
+            ):
+                raise FakeAPIError(
+                    f"duplicate key value violates unique constraint on {table_name}({', '.join(columns)})",
+                    code="23505"
+                )
+
+    def _append(self, table_name, record):
+        rows = self.tables.setdefault(table_name, [])
+        if record.get("id") is None:
+            self._next_ids[table_name] = self._next_ids.get(table_name, 0) + 1
+            record["id"] = self._next_ids[table_name]
+        else:
+            self._next_ids[table_name] = max(self._next_ids.get(table_name, 0), int(record["id"]))
+        rows.append(record)
+        return record
+
+    def seed(self, table_name, rows):
+        with self.lock:
+            for row in rows:
+                self._append(table_name, copy.deepcopy(row))
+
+    def add_unique(self, table_name, *columns):
+        """insert / upsert 시 중복이면 23505 오류를 내는 unique 제약 추가"""
+        self.unique_keys.setdefault(table_name, []).append(columns)
+
+    @property
+    def round_trips(self):
+        return sum(self.stats.values())
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats.clear()
+
+    def register_rpc(self, name, fn):
+        """fn(tables, **params) → 응답 data (잠금 안에서 호출됨)"""
+        self.functions[name] = fn
+
+    def table(self, table_name):
+        return FakeQuery(self, table_name)
+
+    def rpc(self, name, params=None):
+        return FakeRpc(self, name, params or {})
@@ -0,0 +1,173 @@
+"""벤치마크용 응답 픽스처
+
+실제 응답 구조(선택자, 중첩, 주변 노이즈)를 흉내 낸 결정적(deterministic) 응답을 생성한다.
+  - DCInside 목록 / 상세 HTML, Longblack 홈 HTML
+  - App Store 고객 리뷰 RSS(Atom) 페이지, Google Play 리뷰 batchexecute 응답
+실제로 저장한 응답으로 측정하려면 같은 파일명으로 디렉터리에 넣고 --fixture-dir 로 지정한다.
+(페이지 번호가 들어가는 이름은 {page} 자리에 번호를 넣은 파일명을 사용)
+"""
+import datetime
+import json
+import os
+from xml.sax.saxutils import escape
+
+DC_LIST = "dcinside_list.html"
+DC_POST = "dcinside_post.html"
+LONGBLACK_HOME = "longblack_home.html"
+APP_STORE_RSS = "app_store_rss_page{page}.xml"
+PLAY_REVIEWS = "play_reviews_page{page}.txt"
+
+# 생성되는 리뷰의 기준 시각 (최신 리뷰), 이후 리뷰는 한 시간씩 과거
+REVIEW_EPOCH = datetime.datetime(2026, 10, 17, 9, 0, 0)
+
+
+def _noise(blocks):
+    """광고 / 네비게이션 / 스크립트 등 파싱 대상이 아닌 주변 마크업"""
+    parts = []
+    for i in range(blocks):
+        parts.append(
+            f'<div class="aside_box box{i}"><ul class="nav">'
+            + "".join(f'<li><a href="/board/{i}/{j}" class="nav_item">메뉴 {i}-{j}</a></li>' for j in range(12))
+            + f'</ul><script type="text/javascript">var ad_slot_{i} = {{"id": {i}, "size": [300, 250]}};</script>'
+            + f'<p class="desc">광고 영역 {i} 입니다. 플랩풋볼 마이너 갤러리 주변 콘텐츠.</p></div>'
+        )
+    return "".join(parts)
+
+
+def dcinside_list_html(rows=50, first_post_id=100000):
+    trs = []
+    for i in range(rows):
+        post_id = first_post_id + rows - i
+        trs.append(
+            f'<tr class="ub-content us-post" data-no="{post_id}" data-type="icon_txt">'
+            f'<td class="gall_num">{post_id}</td>'
+            f'<td class="gall_tit ub-word"><a href="/mgallery/board/view/?id=plabfootball&no={post_id}&page=1">'
+            f'<em class="icon_img icon_txt"></em>오늘 매치 후기 {post_id}</a>'
+            f'<a class="reply_numbox" href="#"><span class="reply_num">[{i % 7}]</span></a></td>'
+            f'<td class="gall_writer ub-writer" data-nick="작성자{i}" data-uid="" data-ip="1.{i}">'
+            f'<span class="nickname"><em>작성자{i}</em></span><span class="ip">(1.{i})</span></td>'
+            f'<td class="gall_date" title="2025-01-01 12:{i % 60:02d}:00">12:{i % 60:02d}</td>'
+            f'<td class="gall_count">{i * 3}</td><td class="gall_recommend">{i % 5}</td></tr>'
+        )
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="UTF-8"><title>플랩풋볼 마이너 갤러리</title>'
+        + "".join(f'<link rel="stylesheet" href="/css/style{i}.css">' for i in range(20))
+        + '</head><body><div id="top" class="dcwrap">' + _noise(40)
+        + '<table class="gall_list"><thead><tr><th>번호</th><th>제목</th><th>글쓴이</th><th>작성일</th>'
+        + '<th>조회</th><th>추천</th></tr></thead><tbody>' + "".join(trs) + '</tbody></table>'
+        + _noise(40) + '</div></body></html>'
+    )
+
+
+def dcinside_post_html(post_id=100001, paragraphs=30):
+    body = "".join(
+        f'<p>본문 문단 {i}: 오늘 플랩 매치에서 있었던 일입니다. 날씨가 좋아서 재밌게 뛰었습니다.</p>'
+        f'<p><img src="https://dcimg.example/{post_id}/{i}.jpg" alt="img{i}"></p>'
+        for i in range(paragraphs)
+    )
+    comments = "".join(
+        f'<li class="ub-content"><div class="cmt_info"><span class="gall_writer ub-writer" data-nick="댓글{i}">'
+        f'<span class="nickname">댓글{i}</span></span><p class="usertxt">댓글 내용 {i}</p>'
+        f'<span class="date_time">01.01 12:{i % 60:02d}:00</span></div></li>'
+        for i in range(60)
+    )
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="UTF-8"><title>게시글</title></head><body>'
+        + _noise(30)
+        + '<div class="view_content_wrap"><header><div class="gallview_head">'
+        + f'<h3 class="title ub-word"><span class="title_headtext">[일반]</span>'
+        + f'<span class="title_subject">오늘 매치 후기 {post_id}</span></h3>'
+        + '<div class="gall_writer ub-writer" data-nick="작성자" data-uid="writer01">'
+        + '<span class="nickname in" title="작성자"><em>작성자</em></span>'
+        + '<span class="gall_date" title="2025.01.01 12:34:56">2025.01.01 12:34:56</span></div>'
+        + '</div></header><div class="writing_view_box"><div class="write_div">' + body + '</div></div>'
+        + '<div class="comment_box"><ul class="cmt_list">' + comments + '</ul></div></div>'
+        + _noise(30) + '</body></html>'
+    )
+
+
+def longblack_home_html():
+    cards = "".join(
+        f'<div class="note-card"><a href="/note/{i}"><img src="/img/{i}.jpg"><h4>노트 {i}</h4>'
+        f'<p>롱블랙 노트 요약 {i}</p></a></div>'
+        for i in range(80)
+    )
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="UTF-8"><title>LongBlack</title></head><body>'
+        + _noise(20)
+        + '<section class="today"><div class="today-note-link"><a href="https://www.longblack.co/note/1234">'
+        + '오늘의 노트</a></div></section><section class="notes">' + cards + '</section>'
+        + _noise(20) + '</body></html>'
+    )
+
+
+def app_store_rss_xml(page=1, pages=10, per_page=50, app_id=6608972481):
+    """App Store 고객 리뷰 RSS 한 페이지 (1페이지 첫 entry 는 평점 없는 앱 정보, pages 이후는 빈 피드)"""
+    entries = []
+    if page == 1:
+        entries.append(
+            f'<entry><updated>{REVIEW_EPOCH.isoformat()}-07:00</updated><id>{app_id}</id>'
+            '<title>플랩풋볼</title><im:name>플랩풋볼</im:name><rights>© PLAB</rights></entry>'
+        )
+    if page <= pages:
+        for i in range((page - 1) * per_page, page * per_page):
+            updated = REVIEW_EPOCH - datetime.timedelta(hours=i)
+            entries.append(
+                f'<entry><updated>{updated.isoformat()}-07:00</updated><id>{11000000000 - i}</id>'
+                f'<title>리뷰 제목 {i}</title>'
+                f'<content type="text">{escape(f"앱 리뷰 본문 {i}: 매치 신청이 편하고 구장 정보가 자세해요.")}</content>'
+                f'<im:contentType term="Application" label="앱"/><im:voteSum>0</im:voteSum>'
+                f'<im:voteCount>0</im:voteCount><im:rating>{i % 5 + 1}</im:rating><im:version>3.{i % 10}.0</im:version>'
+                f'<author><name>작성자{i}</name><uri>https://itunes.apple.com/kr/reviews/id{i}</uri></author>'
+                f'<link rel="related" href="https://itunes.apple.com/kr/review?id={app_id}&amp;type=Purple%20Software"/>'
+                '</entry>'
+            )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<feed xmlns:im="http://itunes.apple.com/rss" xmlns="http://www.w3.org/2005/Atom" xml:lang="ko">'
+        f'<id>https://itunes.apple.com/kr/rss/customerreviews/page={page}/id={app_id}/sortby=mostrecent/xml</id>'
+        '<title>iTunes Store: 고객 리뷰</title><updated>2026-10-17T09:00:00-07:00</updated>'
+        + "".join(entries) + '</feed>'
+    )
+
+
+def play_reviews_payload(page=1, pages=5, per_page=100):
+    """Google Play batchexecute 리뷰 응답 (google_play_scraper 가 파싱하는 형태, 마지막 페이지는 token 없음)"""
+    items = []
+    for i in range((page - 1) * per_page, page * per_page):
+        at = REVIEW_EPOCH - datetime.timedelta(hours=i)
+        items.append([
+            f"gp:{i:08d}",
+            [f"사용자{i}", [None, 2, None, [None, None, f"https://play-lh.example/{i}"]]],
+            i % 5 + 1,
+            None,
+            f"구글 플레이 리뷰 {i}: 매치 잡기 편해요",
+            [int(at.replace(tzinfo=datetime.timezone.utc).timestamp()), 0],
+            i % 3,
+            None,
+            None,
+            None,
+            f"3.{i % 10}.0",
+        ])
+    token = f"page-{page + 1}" if page < pages else None
+    inner = json.dumps([items, [None, token], None], ensure_ascii=False)
+    return ")]}'\n\n" + json.dumps([["wrb.fr", "oCPfdb", inner, None, None, None, "generic"]], ensure_ascii=False)
+
+
+GENERATORS = {
+    DC_LIST: dcinside_list_html,
+    DC_POST: dcinside_post_html,
+    LONGBLACK_HOME: longblack_home_html,
+    APP_STORE_RSS: app_store_rss_xml,
+    PLAY_REVIEWS: play_reviews_payload,
+}
+
+
+def load(name, fixture_dir=None, **kwargs):
+    """fixture_dir 에 저장된 응답이 있으면 그것을, 없으면 kwargs 로 생성한 응답을 반환"""
+    if fixture_dir:
+        path = os.path.join(fixture_dir, name.format(**kwargs))
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+    return GENERATORS[name](**kwargs)
@@ -0,0 +1,93 @@
+"""HTML 파서 백엔드별 파싱 시간 / 최대 메모리 비교
+
+사용법:
+    python benchmarks/html_parse_bench.py [--repeat 20] [--fixture-dir path/to/saved_html]
+
+html.parser / lxml(설치된 경우) 각각에 대해 전체 트리 파싱과 SoupStrainer 부분 파싱을 측정한다.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "automation"))
+
+import fixtures  # noqa: E402
+from html_soup import make_soup, DC_LIST_ONLY, DC_DETAIL_ONLY, LONGBLACK_TODAY_ONLY  # noqa: E402
+
+
+def extract_list(soup):
+    return [a["href"] for a in soup.select("tr.ub-content td.gall_tit a:first-of-type")]
+
+
+def extract_detail(soup):
+    title = soup.select_one("span.title_subject")
+    content = soup.select_one("div.write_div")
+    date = soup.select_one("span.gall_date")
+    return (
+        title.get_text(strip=True) if title else None,
+        content.get_text(strip=True, separator="\n") if content else None,
+        date.get_text(strip=True) if date else None,
+    )
+
+
+def extract_longblack(soup):
+    container = soup.find("div", class_="today-note-link")
+    anchor = container.find("a", href=True) if container else None
+    return anchor["href"] if anchor else None
+
+
+CASES = [
+    ("dcinside list", fixtures.DC_LIST, DC_LIST_ONLY, extract_list),
+    ("dcinside detail", fixtures.DC_POST, DC_DETAIL_ONLY, extract_detail),
+    ("longblack home", fixtures.LONGBLACK_HOME, LONGBLACK_TODAY_ONLY, extract_longblack),
+]
+
+
+def available_parsers():
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.append("lxml")
+    except ImportError:
+        print("ℹ️ lxml 이 설치되어 있지 않아 html.parser 만 측정합니다.")
+    return parsers
+
+
+def measure(markup, parser, only, extract, repeat):
+    """(평균 파싱+추출 시간 ms, 최대 메모리 KiB, 추출 결과)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = extract(make_soup(markup, only=only, parser=parser))
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    extract(make_soup(markup, only=only, parser=parser))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 1024, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--fixture-dir", help="실제로 저장한 HTML 파일 디렉터리")
+    args = parser.parse_args()
+
+    print(f"{'case':<18} {'parser':<12} {'mode':<9} {'ms/parse':>10} {'peak KiB':>10}")
+    for name, fixture, only, extract in CASES:
+        markup = fixtures.load(fixture, args.fixture_dir)
+        baseline = None
+        for backend in available_parsers():
+            for mode, strainer in (("full", None), ("strained", only)):
+                elapsed_ms, peak_kib, result = measure(markup, backend, strainer, extract, args.repeat)
+                if baseline is None:
+                    baseline = result
+                elif result != baseline:
+                    print(f"⚠️ {name} {backend}/{mode} 추출 결과가 html.parser/full 과 다릅니다.")
+                print(f"{name:<18} {backend:<12} {mode:<9} {elapsed_ms:>10.2f} {peak_kib:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
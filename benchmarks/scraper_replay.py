@@ -0,0 +1,337 @@
+"""스크래핑 파이프라인 리플레이 벤치마크 (네트워크 없이 로컬에서 실행)
+
+사용법:
+    python benchmarks/scraper_replay.py [--latency 0.05] [--db-latency 0.02] [--only dcinside.main,...]
+                                        [--fixture-dir path/to/recorded] [--dc-rps 1000] [--slack-rps 1000]
+                                        [--play-reviews 100] [--rss-pages 2] [--no-etag]
+
+호스트(DCInside, Longblack, iTunes RSS, Google Play, Slack)마다 로컬 HTTP 서버를 띄워
+픽스처 응답을 지연(--latency)과 함께 돌려주고 (GET 응답에는 ETag 를 붙여 If-None-Match 가 맞으면 304,
+--no-etag 면 검증자 없이 항상 200), Supabase 는 인메모리 대역(fake_supabase)으로 바꾼 뒤
+시나리오마다 새 프로세스에서 cold(빈 DB/커서) → warm(같은 응답으로 재실행) 순서로 실행해
+  - 걸린 시간
+  - 호스트별 외부 요청 수
+  - Supabase 왕복 수
+  - 파싱에 쓴 CPU 시간 (make_soup / RSS 스트리밍 파서 / Google Play 응답 파싱)
+  - 최대 RSS
+를 출력한다. Google Play 는 google_play_scraper 의 요청 URL 을 로컬 서버로 바꿔 재생한다.
+"""
+import argparse
+import asyncio
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "automation"))
+
+import fixtures  # noqa: E402
+from fake_supabase import FakeSupabase  # noqa: E402
+
+SCENARIOS = [
+    "app_review.run",
+    "dcinside.get_posts",
+    "dcinside.main",
+    "longblack.fetch_today_note_link",
+    "longblack.main",
+    "all.sequential",
+    "all.async",
+]
+
+APPLE_APP_ID = 6608972481
+
+
+class ReplayServer:
+    """한 호스트를 흉내 내는 로컬 서버: route(method, path, body) → (status, content_type, body)"""
+
+    def __init__(self, name, route, latency, etag=True):
+        self.name = name
+        self.requests = Counter()
+        lock = threading.Lock()
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def handle_request(self, method):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with lock:
+                    replay.requests[replay.name] += 1
+                if latency:
+                    time.sleep(latency)
+                status, content_type, payload = route(method, self.path, body)
+                headers = {"Content-Type": content_type}
+                if etag and method == "GET" and status == 200:
+                    headers["ETag"] = f'"{hashlib.sha1(payload).hexdigest()}"'
+                    if self.headers.get("If-None-Match") == headers["ETag"]:
+                        status, payload = 304, b""
+                        with lock:
+                            replay.requests[f"{replay.name}(304)"] += 1
+                self.send_response(status)
+                for header, value in headers.items():
+                    self.send_header(header, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self.handle_request("GET")
+
+            def do_POST(self):
+                self.handle_request("POST")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.server.request_queue_size = 256
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+
+def build_servers(args):
+    @functools.lru_cache(maxsize=None)
+    def page(name, **kwargs):
+        return fixtures.load(name, args.fixture_dir, **kwargs).encode("utf-8")
+
+    html = "text/html; charset=utf-8"
+
+    def dcinside(method, path, body):
+        if path.startswith("/mgallery/board/view"):
+            post_id = int(parse_qs(urlparse(path).query).get("no", ["100001"])[0])
+            return 200, html, page(fixtures.DC_POST, post_id=post_id)
+        return 200, html, page(fixtures.DC_LIST)
+
+    def longblack(method, path, body):
+        return 200, html, page(fixtures.LONGBLACK_HOME)
+
+    def itunes(method, path, body):
+        number = int(re.search(r"page=(\d+)", path).group(1))
+        return 200, "application/xml; charset=utf-8", page(
+            fixtures.APP_STORE_RSS, page=number, pages=args.rss_pages, app_id=APPLE_APP_ID
+        )
+
+    def play(method, path, body):
+        token = re.search(r"%5C%22page-(\d+)%5C%22", body.decode("utf-8"))
+        number = int(token.group(1)) if token else 1
+        return 200, "application/json; charset=utf-8", page(
+            fixtures.PLAY_REVIEWS, page=number, per_page=args.play_reviews
+        )
+
+    def slack(method, path, body):
+        return 200, "text/plain", b"ok"
+
+    routes = {
+        "gall.dcinside.com": dcinside,
+        "www.longblack.co": longblack,
+        "itunes.apple.com": itunes,
+        "play.google.com": play,
+        "hooks.slack.com": slack,
+    }
+    return {name: ReplayServer(name, route, args.latency, etag=not args.no_etag) for name, route in routes.items()}
+
+
+class ParseTimer:
+    """파싱 함수 안에서 쓴 스레드 CPU 시간을 모든 스레드에 걸쳐 합산"""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, seconds):
+        with self.lock:
+            self.seconds += seconds
+
+    def wrap(self, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.thread_time()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(time.thread_time() - started)
+        return timed
+
+    def wrap_iter(self, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            iterator = fn(*args, **kwargs)
+            while True:
+                started = time.thread_time()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.add(time.thread_time() - started)
+                yield item
+        return timed
+
+
+def run_child(args):
+    """한 시나리오를 cold / warm 두 번 실행하고 결과를 JSON 한 줄로 출력"""
+    servers = build_servers(args)
+    workdir = tempfile.mkdtemp(prefix="scraper_replay_")
+    os.environ.update({
+        "SUPABASE_URL": "http://127.0.0.1:9",
+        "SUPABASE_KEY": "replay",
+        "CURSOR_BACKEND": "json",
+        "CURSOR_PATH": os.path.join(workdir, "cursors.json"),
+        "DC_REQUESTS_PER_SECOND": str(args.dc_rps),
+        "SLACK_MESSAGES_PER_SECOND": str(args.slack_rps),
+        "DC_GALLERY_URL": f"{servers['gall.dcinside.com'].url}/mgallery/board/lists/?id=plabfootball",
+        "LONGBLACK_URL": f"{servers['www.longblack.co'].url}/",
+        "APP_STORE_RSS_BASE_URL": servers["itunes.apple.com"].url,
+        "DCINSIDE_SLACK_WEBHOOK_URL": f"{servers['hooks.slack.com'].url}/dcinside",
+        "DEV_ARTICLE_SLACK_WEBHOOK_URL": f"{servers['hooks.slack.com'].url}/longblack",
+    })
+
+    import transport
+    import app_review_scraper
+    import dcinside_plabgallery_scraper as dc
+    import longblack_today_article_scraper as longblack
+    import scrape_all
+    from google_play_scraper.constants.request import Formats
+    from google_play_scraper.features import reviews as play_reviews
+
+    # Google Play shim: 라이브러리의 batchexecute URL 을 로컬 서버로
+    Formats.Reviews.URL_FORMAT = f"{servers['play.google.com'].url}/_/PlayStoreUi/data/batchexecute?hl={{lang}}&gl={{country}}"
+
+    timer = ParseTimer()
+    dc.make_soup = timer.wrap(dc.make_soup)
+    longblack.make_soup = timer.wrap(longblack.make_soup)
+    app_review_scraper.iter_feed_entries = timer.wrap_iter(app_review_scraper.iter_feed_entries)
+    play_reviews._fetch_review_items = timer.wrap(play_reviews._fetch_review_items)
+
+    fake = FakeSupabase(latency=args.db_latency)
+    fake.add_unique("plab_review", "platform_type", "platform_review_id")
+    fake.add_unique("dc_posts", "post_id")
+    fake.add_unique("longblack_today_article", "url")
+    transport.set_supabase(fake)
+
+    app_config = {
+        "app_name": "플랩풋볼", "table_name": "plab_review",
+        "slack_webhook_url": f"{servers['hooks.slack.com'].url}/app_review",
+        "google_package_name": "com.myplaycompany.plab", "apple_app_id": APPLE_APP_ID,
+        "count": args.play_reviews,
+    }
+
+    def app_review_run():
+        app_review_scraper.AppReviewScraper(**app_config).run()
+
+    def all_sequential():
+        # cron 으로 하나씩 실행하던 방식 (프로세스 기동 비용 제외)
+        app_review_run()
+        dc.main()
+        longblack.main()
+
+    def all_async():
+        results = asyncio.run(scrape_all.run({"plab": app_config}))
+        failed = [name for name, result in results.items() if not result["ok"]]
+        if failed:
+            raise RuntimeError(f"failed: {failed}")
+
+    scenario = {
+        "app_review.run": app_review_run,
+        "dcinside.get_posts": dc.get_posts,
+        "dcinside.main": dc.main,
+        "longblack.fetch_today_note_link": longblack.fetch_today_note_link,
+        "longblack.main": longblack.main,
+        "all.sequential": all_sequential,
+        "all.async": all_async,
+    }[args.child]
+
+    phases = []
+    for phase in ("cold", "warm"):
+        for server in servers.values():
+            server.requests.clear()
+        fake.reset_stats()
+        timer.seconds = 0.0
+        error = None
+        started = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                scenario()
+        except (Exception, SystemExit) as e:
+            error = repr(e)
+        wall = time.perf_counter() - started
+        requests = Counter()
+        for server in servers.values():
+            requests.update(server.requests)
+        phases.append({
+            "phase": phase,
+            "wall_ms": wall * 1000,
+            "parse_cpu_ms": timer.seconds * 1000,
+            "db_round_trips": fake.round_trips,
+            "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "requests": dict(requests),
+            "error": error,
+        })
+    print(json.dumps(phases, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="외부 호스트 응답 지연 (초)")
+    parser.add_argument("--db-latency", type=float, default=0.02, help="Supabase 요청당 지연 (초)")
+    parser.add_argument("--only", help="실행할 시나리오 (쉼표 구분)")
+    parser.add_argument("--fixture-dir", help="저장해 둔 실제 응답 디렉터리 (fixtures.py 파일명 규칙)")
+    parser.add_argument("--dc-rps", type=float, default=1000,
+                        help="DCInside 상세 요청 속도 제한 (실제 기본값 2 로 두면 속도 제한 대기 시간이 대부분)")
+    parser.add_argument("--slack-rps", type=float, default=1000,
+                        help="Slack webhook 별 발송 속도 제한 (실제 기본값 1 로 두면 속도 제한 대기 시간이 대부분)")
+    parser.add_argument("--play-reviews", type=int, default=100, help="Google Play 에서 가져올 리뷰 수")
+    parser.add_argument("--rss-pages", type=int, default=2, help="리뷰가 들어 있는 RSS 페이지 수 (이후는 빈 피드)")
+    parser.add_argument("--no-etag", action="store_true",
+                        help="ETag / 304 없이 항상 200 (warm 실행은 내용 지문 비교로만 건너뜀)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    names = args.only.split(",") if args.only else SCENARIOS
+    forwarded = [
+        "--latency", str(args.latency), "--db-latency", str(args.db_latency),
+        "--dc-rps", str(args.dc_rps), "--slack-rps", str(args.slack_rps),
+        "--play-reviews", str(args.play_reviews), "--rss-pages", str(args.rss_pages),
+    ] + (["--fixture-dir", args.fixture_dir] if args.fixture_dir else []) + (["--no-etag"] if args.no_etag else [])
+
+    print(f"latency={args.latency * 1000:.0f}ms db_latency={args.db_latency * 1000:.0f}ms "
+          f"dc_rps={args.dc_rps:g} slack_rps={args.slack_rps:g} play_reviews={args.play_reviews} rss_pages={args.rss_pages} "
+          f"etag={'off' if args.no_etag else 'on'}")
+    for name in names:
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", name, *forwarded],
+            capture_output=True, text=True
+        )
+        print(f"\n== {name}")
+        if result.returncode != 0:
+            print(f"  ❌ 실행 실패\n{result.stderr}")
+            continue
+        print(f"  {'phase':<6} {'wall':>10} {'parse CPU':>11} {'DB trips':>9} {'peak RSS':>10}  requests")
+        for row in json.loads(result.stdout.strip().splitlines()[-1]):
+            requests = ", ".join(f"{host}={n}" for host, n in sorted(row["requests"].items())) or "-"
+            print(f"  {row['phase']:<6} {row['wall_ms']:8.1f}ms {row['parse_cpu_ms']:9.1f}ms "
+                  f"{row['db_round_trips']:>9} {row['peak_rss_mib']:7.1f}MiB  {requests}")
+            if row["error"]:
+                print(f"    ⚠️ {row['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Slack 알림 폭주 시 발송 방식 비교 (네트워크 없이 로컬에서 실행)
+
+사용법:
+    python benchmarks/slack_burst.py [--items 60] [--webhooks 3] [--limit-rps 1] [--limit-burst 3]
+                                     [--error-rate 0.05] [--latency 0.05]
+
+webhook 마다 초당 --limit-rps 개(순간 --limit-burst 개)를 넘으면 429 + Retry-After 를,
+--error-rate 확률로 503 을 돌려주는 로컬 Slack 대역을 띄우고, 같은 알림 묶음을
+  - per-item : 알림마다 POST 한 번, 응답은 무시 (기존 방식)
+  - queue    : slack_queue.SlackQueue (webhook 별 묶음 + 속도 제한 + Retry-After 재시도, webhook 간 병렬)
+로 보내 걸린 시간, 보낸 메시지 수, 실제로 도착한 알림 수와 유실 수를 출력한다.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "automation"))
+
+import transport  # noqa: E402
+from slack_queue import SlackQueue, format_stats, section  # noqa: E402
+
+
+class FakeSlack:
+    """webhook 경로별 토큰 버킷으로 속도를 제한하는 Slack Incoming Webhook 대역"""
+
+    def __init__(self, limit_rps, limit_burst, error_rate, latency, seed):
+        self.delivered = set()
+        self.responses = Counter()
+        self.lock = threading.Lock()
+        rng = random.Random(seed)
+        buckets = {}
+        slack = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+                if latency:
+                    time.sleep(latency)
+                with slack.lock:
+                    now = time.monotonic()
+                    tokens, updated = buckets.get(self.path, (limit_burst, now))
+                    tokens = min(limit_burst, tokens + (now - updated) * limit_rps)
+                    if rng.random() < error_rate:
+                        status = 503
+                    elif tokens >= 1:
+                        status, tokens = 200, tokens - 1
+                        slack.delivered.update(re.findall(r"item-\d+", body))
+                    else:
+                        status = 429
+                    buckets[self.path] = (tokens, now)
+                    slack.responses[status] += 1
+                payload = b"ok" if status == 200 else b"rate_limited" if status == 429 else b"error"
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+
+def notifications(items, webhooks, base_url):
+    for i in range(items):
+        text = f"📱 *Google Play 리뷰 도착!* item-{i}\n💬 내용: 매치 잡기 편해요"
+        yield f"{base_url}/hook{i % webhooks}", [section(text), {"type": "divider"}], text
+
+
+def per_item(batch):
+    for webhook_url, blocks, text in batch:
+        try:
+            transport.post(webhook_url, data=json.dumps({"text": text, "blocks": blocks}),
+                           headers={"Content-Type": "application/json"})
+        except Exception:
+            pass
+    return {"messages": len(batch)}
+
+
+def queued(batch, args):
+    queue = SlackQueue(rate=args.limit_rps, burst=args.limit_burst)
+    for webhook_url, blocks, text in batch:
+        queue.enqueue(webhook_url, blocks, text)
+    result = queue.flush()
+    print(f"  {format_stats(result)}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=60)
+    parser.add_argument("--webhooks", type=int, default=3)
+    parser.add_argument("--limit-rps", type=float, default=1, help="webhook 별 허용 초당 메시지 수")
+    parser.add_argument("--limit-burst", type=int, default=3, help="webhook 별 순간 허용 메시지 수")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="503 응답 확률")
+    parser.add_argument("--latency", type=float, default=0.05, help="Slack 응답 지연 (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"items={args.items} webhooks={args.webhooks} limit={args.limit_rps:g}/s burst={args.limit_burst} "
+          f"error_rate={args.error_rate:g} latency={args.latency * 1000:.0f}ms")
+    for name in ("per-item", "queue"):
+        slack = FakeSlack(args.limit_rps, args.limit_burst, args.error_rate, args.latency, args.seed)
+        batch = list(notifications(args.items, args.webhooks, slack.url))
+        print(f"\n== {name}")
+        started = time.perf_counter()
+        result = per_item(batch) if name == "per-item" else queued(batch, args)
+        elapsed = time.perf_counter() - started
+        responses = ", ".join(f"{status}={n}" for status, n in sorted(slack.responses.items()))
+        print(f"  elapsed={elapsed:.2f}s messages={result['messages']} responses=({responses})")
+        print(f"  delivered={len(slack.delivered)}/{args.items} lost={args.items - len(slack.delivered)}")
+        slack.server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""/온콜리스트, /온콜바꿔 슬래시 커맨드 부하 테스트 (네트워크 없이 로컬에서 실행)
+
+사용법:
+    python benchmarks/slash_command_load.py [--requests 200] [--concurrency 20] [--db-latency 0.03]
+                                            [--swap-ratio 0.2] [--no-rpc] [--cache-ttl 10] [--ack-deadline 2.5]
+
+api/oncall.py, api/swap_oncall.py 의 handler 를 로컬 ThreadingHTTPServer 로 띄우고,
+Supabase 대신 인메모리 대역(fake_supabase)을, Slack response_url 대신 로컬 수신 서버를 사용한다.
+Slack 과 같은 form-urlencoded POST 를 동시에 보내 다음을 측정한다.
+  - 첫 바이트까지의 지연 (p50 / p95 / p99, /온콜바꿔 는 교체 결과 또는 ack)
+  - ACK_DEADLINE 을 넘겨 ack 후 response_url 로 결과를 보낸 수와 도착 시간
+  - 3초(Slack 슬래시 커맨드 제한)를 넘긴 응답 수
+  - 처리량 (req/s)
+"""
+import argparse
+import contextlib
+import datetime
+import http.client
+import io
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "api"))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "load-test")
+
+import oncall  # noqa: E402
+import swap_oncall  # noqa: E402
+from fake_supabase import FakeSupabase  # noqa: E402
+
+# Slack 슬래시 커맨드 응답 제한 (초)
+SLACK_TIMEOUT = 3.0
+
+MEMBERS = ["따오", "워즈", "로쿤", "정남", "엔도", "루니", "벨", "맥국", "히로", "키커"]
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # 동시 접속이 몰려도 listen backlog 초과로 연결이 거부되지 않도록
+    request_queue_size = 256
+
+
+def swap_oncall_rpc(tables, p_member1, p_member2, p_from):
+    """supabase/migrations 의 swap_oncall 함수와 같은 동작 (fake 잠금 안에서 실행)"""
+    rows = tables.get("oncall_rotation", [])
+
+    def nearest(member):
+        candidates = sorted((r for r in rows if r["member"] == member and r["date"] >= p_from), key=lambda r: (r["date"], r["id"]))
+        return candidates[0] if candidates else None
+
+    s1, s2 = nearest(p_member1), nearest(p_member2)
+    if not (s1 and s2):
+        return {"schedule1": dict(s1) if s1 else None, "schedule2": dict(s2) if s2 else None, "swapped": False}
+    original1, original2 = dict(s1), dict(s2)
+    s1["member"], s2["member"] = p_member2, p_member1
+    bump_rotation_version(tables)
+    return {"schedule1": original1, "schedule2": original2, "swapped": True}
+
+
+def bump_rotation_version(tables):
+    """oncall_rotation 트리거(oncall_rotation_version_bump)와 같은 동작"""
+    tables.setdefault("oncall_rotation_version", [{"id": 1, "version": 1}])[0]["version"] += 1
+
+
+def rotation_version(tables):
+    return tables.setdefault("oncall_rotation_version", [{"id": 1, "version": 1}])[0]["version"]
+
+
+def get_oncall_list_cache_rpc(tables, p_cache_key):
+    version = rotation_version(tables)
+    row = next((r for r in tables.get("oncall_list_cache", []) if r["cache_key"] == p_cache_key), None)
+    payload = row["payload"] if row and row["version"] == version else None
+    return {"version": version, "payload": payload}
+
+
+def store_oncall_list_cache_rpc(tables, p_cache_key, p_version, p_payload):
+    if p_version != rotation_version(tables):
+        return False
+    rows = tables.setdefault("oncall_list_cache", [])
+    row = next((r for r in rows if r["cache_key"] == p_cache_key), None)
+    if row is None:
+        rows.append({"cache_key": p_cache_key, "payload": p_payload, "version": p_version})
+    elif row["version"] < p_version:
+        row.update(payload=p_payload, version=p_version)
+    else:
+        return False
+    return True
+
+
+def build_fake(db_latency, use_rpc):
+    fake = FakeSupabase(latency=db_latency)
+    today = datetime.date.today()
+    rows = []
+    members = itertools.cycle(MEMBERS)
+    for offset in range(-7, 90):
+        day = today + datetime.timedelta(days=offset)
+        if day.weekday() >= 5:
+            rows.append({"date": day.isoformat(), "member": next(members)})
+    fake.seed("oncall_rotation", rows)
+    if use_rpc:
+        fake.register_rpc("swap_oncall", swap_oncall_rpc)
+        fake.register_rpc("get_oncall_list_cache", get_oncall_list_cache_rpc)
+        fake.register_rpc("store_oncall_list_cache", store_oncall_list_cache_rpc)
+    return fake
+
+
+class ResponseSink:
+    """Slack response_url 대역: 요청 경로(/<request id>)별 도착 시각을 기록"""
+
+    def __init__(self):
+        self.arrivals = {}
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+                sink.arrivals[self.path.lstrip("/")] = time.perf_counter()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+
+def serve(module):
+    class QuietHandler(module.handler):
+        def log_message(self, *args):
+            pass
+
+    server = Server(("127.0.0.1", 0), QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def post(port, body):
+    """(첫 바이트까지 시간, 요청 시작 시각, 상태 코드, ack 여부)
+
+    handler 는 ack 를 보낸 뒤에도 결과 전송까지 연결을 쥐고 있으므로, Slack 처럼 본문(Content-Length)까지만 읽는다.
+    """
+    started = time.perf_counter()
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request("POST", "/", body=body.encode("utf-8"),
+                 headers={"Content-Type": "application/x-www-form-urlencoded"})
+    response = conn.getresponse()
+    first_byte = time.perf_counter() - started
+    payload = response.read()
+    conn.close()
+    acked = response.status == 200 and json.loads(payload).get("response_type") == "ephemeral"
+    return first_byte, started, response.status, acked
+
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(p / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def report(name, values):
+    ms = [v * 1000 for v in values]
+    print(f"  {name:<28} n={len(ms):<5} p50={percentile(ms, 50):8.1f}ms  "
+          f"p95={percentile(ms, 95):8.1f}ms  p99={percentile(ms, 99):8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--db-latency", type=float, default=0.03, help="Supabase 요청당 지연 (초)")
+    parser.add_argument("--swap-ratio", type=float, default=0.2, help="/온콜바꿔 요청 비율")
+    parser.add_argument("--no-rpc", action="store_true",
+                        help="swap_oncall / oncall_list_cache RPC 없이 fallback 경로 측정")
+    parser.add_argument("--cache-ttl", type=float, help="oncall.CACHE_TTL 덮어쓰기 (0 이면 메모리 캐시 미사용)")
+    parser.add_argument("--ack-deadline", type=float,
+                        help="swap_oncall.ACK_DEADLINE 덮어쓰기 (이 시간을 넘기면 ack 후 response_url 로 결과 전송)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="핸들러 로그 출력")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    fake = build_fake(args.db_latency, not args.no_rpc)
+    oncall.supabase = fake
+    swap_oncall.supabase = fake
+    swap_oncall.use_swap_rpc = not args.no_rpc
+    oncall.use_cache_rpc = not args.no_rpc
+    if args.cache_ttl is not None:
+        oncall.CACHE_TTL = args.cache_ttl
+    if args.ack_deadline is not None:
+        swap_oncall.ACK_DEADLINE = args.ack_deadline
+
+    sink = ResponseSink()
+    list_server = serve(oncall)
+    swap_server = serve(swap_oncall)
+
+    jobs = []
+    for i in range(args.requests):
+        if rng.random() < args.swap_ratio:
+            member1, member2 = rng.sample(MEMBERS, 2)
+            body = urlencode({"command": "/온콜바꿔", "text": f"{member1} {member2}",
+                              "response_url": f"{sink.url}/{i}"})
+            jobs.append((i, "swap", swap_server.server_port, body))
+        else:
+            body = urlencode({"command": "/온콜리스트"})
+            jobs.append((i, "list", list_server.server_port, body))
+
+    results = {}
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.ExitStack()
+    with quiet as stack:
+        if stack is not None:
+            stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            stack.enter_context(contextlib.redirect_stderr(io.StringIO()))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = {executor.submit(post, port, body): (i, kind) for i, kind, port, body in jobs}
+            for future, (i, kind) in futures.items():
+                results[i] = (kind, *future.result())
+        # ack 를 보낸 요청은 handler 가 결과를 response_url 로 보낼 때까지 기다림
+        acked = sum(1 for *_, ack in results.values() if ack)
+        deadline = time.monotonic() + 30
+        while len(sink.arrivals) < acked and time.monotonic() < deadline:
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+
+    first_bytes = {"list": [], "swap": []}
+    delayed = []
+    errors = 0
+    for i, (kind, first_byte, request_started, status, _) in results.items():
+        first_bytes[kind].append(first_byte)
+        errors += status != 200
+        if str(i) in sink.arrivals:
+            delayed.append(sink.arrivals[str(i)] - request_started)
+    too_slow = sum(1 for values in first_bytes.values() for v in values if v > SLACK_TIMEOUT)
+
+    print(f"requests={args.requests} concurrency={args.concurrency} db_latency={args.db_latency * 1000:.0f}ms "
+          f"rpc={'off' if args.no_rpc else 'on'} cache_ttl={oncall.CACHE_TTL}s ack_deadline={swap_oncall.ACK_DEADLINE}s")
+    report("/온콜리스트 first byte", first_bytes["list"])
+    report("/온콜바꿔 first byte", first_bytes["swap"])
+    report("/온콜바꿔 response_url (ack 후)", delayed)
+    print(f"  throughput                   {args.requests / elapsed:8.1f} req/s  ({elapsed:.2f}s)")
+    print(f"  errors                       {errors}  over {SLACK_TIMEOUT:.0f}s: {too_slow}  "
+          f"acked: {acked}  missing delayed responses: {acked - len(delayed)}")
+
+
+if __name__ == "__main__":
+    main()
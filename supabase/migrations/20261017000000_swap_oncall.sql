@@ -0,0 +1,52 @@
+-- /온콜바꿔: 두 멤버의 p_from 이후 가장 가까운 온콜 일정을 찾아 담당자를 교체
+-- 조회와 교체가 하나의 트랜잭션에서 실행되며, 동시에 들어온 요청은 advisory lock 으로 직렬화된다.
+-- 같은 날짜에 같은 멤버의 행이 여럿이면 id 가 작은 행을 고른다 (api/swap_oncall.py fallback 과 동일).
+-- 반환: {"schedule1": row | null, "schedule2": row | null, "swapped": bool} (row 는 교체 전 원본)
+create or replace function public.swap_oncall(p_member1 text, p_member2 text, p_from text)
+returns jsonb
+language plpgsql
+as $$
+declare
+    s1 public.oncall_rotation%rowtype;
+    s2 public.oncall_rotation%rowtype;
+    found1 boolean;
+    found2 boolean;
+begin
+    perform pg_advisory_xact_lock(hashtext('swap_oncall'));
+
+    select * into s1
+      from public.oncall_rotation
+     where member = p_member1
+       and date >= p_from::date
+     order by date, id
+     limit 1
+       for update;
+    found1 := found;
+
+    select * into s2
+      from public.oncall_rotation
+     where member = p_member2
+       and date >= p_from::date
+     order by date, id
+     limit 1
+       for update;
+    found2 := found;
+
+    if not (found1 and found2) then
+        return jsonb_build_object(
+            'schedule1', case when found1 then to_jsonb(s1) end,
+            'schedule2', case when found2 then to_jsonb(s2) end,
+            'swapped', false
+        );
+    end if;
+
+    update public.oncall_rotation set member = p_member2 where id = s1.id;
+    update public.oncall_rotation set member = p_member1 where id = s2.id;
+
+    return jsonb_build_object(
+        'schedule1', to_jsonb(s1),
+        'schedule2', to_jsonb(s2),
+        'swapped', true
+    );
+end;
+$$;
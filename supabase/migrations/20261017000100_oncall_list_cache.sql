@@ -0,0 +1,7 @@
+-- /온콜리스트 응답 캐시 (KST 날짜별로 미리 계산된 Slack Block Kit 응답)
+-- oncall_rotation 을 바꾸는 쪽(swap_schedules / swap_oncall RPC 호출 후, schedule_monthly_oncall)에서 전체 삭제한다.
+create table if not exists public.oncall_list_cache (
+    cache_key text primary key,
+    payload jsonb not null,
+    created_at timestamptz not null default now()
+);
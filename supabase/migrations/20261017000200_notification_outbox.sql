@@ -0,0 +1,23 @@
+-- 알림 outbox: 스크래퍼가 저장한 행의 Slack 발송 여부
+-- 새 행은 notified = false 로 저장되고, automation/outbox.py 의 drain 단계가 발송 후 true 로 바꾼다.
+-- 기존 행은 이미 알림이 나간 것으로 보고 true 로 채운 뒤 기본값을 false 로 바꾼다.
+do $$
+declare
+    t text;
+begin
+    foreach t in array array[
+        'dc_posts',
+        'longblack_today_article',
+        'plab_review',
+        'manager_review',
+        'iamground_review',
+        'puzzle_review',
+        'letsgoale_review',
+        'matchup_review'
+    ] loop
+        execute format('alter table public.%I add column if not exists notified boolean not null default true', t);
+        execute format('alter table public.%I alter column notified set default false', t);
+        execute format('create index if not exists %I on public.%I (id) where not notified', t || '_pending_notify_idx', t);
+    end loop;
+end;
+$$;
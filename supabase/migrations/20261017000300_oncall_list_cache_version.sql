@@ -0,0 +1,68 @@
+-- /온콜리스트 캐시를 oncall_rotation 버전으로 검증
+-- oncall_rotation 이 바뀔 때마다(swap_oncall RPC, /온콜바꿔 fallback, 월간 스케줄 생성, 대시보드 편집 모두)
+-- 같은 트랜잭션 안에서 트리거가 버전을 올린다. 캐시 행은 계산에 사용한 버전과 함께 저장되고,
+-- 현재 버전과 같을 때만 사용된다. 교체 전에 읽은 요청이 늦게 저장하더라도 버전이 낮아 쓰이지 않는다.
+-- api/oncall.py 는 이 마이그레이션의 함수(get_oncall_list_cache / store_oncall_list_cache)를 사용하므로 먼저 배포한다.
+create table if not exists public.oncall_rotation_version (
+    id smallint primary key default 1 check (id = 1),
+    version bigint not null default 1,
+    updated_at timestamptz not null default now()
+);
+insert into public.oncall_rotation_version (id) values (1) on conflict (id) do nothing;
+
+create or replace function public.bump_oncall_rotation_version()
+returns trigger
+language plpgsql
+as $$
+begin
+    update public.oncall_rotation_version
+       set version = version + 1, updated_at = now()
+     where id = 1;
+    return null;
+end;
+$$;
+
+drop trigger if exists oncall_rotation_version_bump on public.oncall_rotation;
+create trigger oncall_rotation_version_bump
+after insert or update or delete or truncate on public.oncall_rotation
+for each statement execute function public.bump_oncall_rotation_version();
+
+-- payload 는 이제 스케줄 행 목록 (Slack 응답과 "마지막 업데이트" 시각은 응답할 때 만든다)
+-- 기존 행은 버전 0 이라 사용되지 않는다.
+alter table public.oncall_list_cache add column if not exists version bigint not null default 0;
+
+-- 반환: {"version": 현재 버전, "payload": 현재 버전으로 계산된 캐시 | null}
+create or replace function public.get_oncall_list_cache(p_cache_key text)
+returns jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'version', v.version,
+        'payload', (select c.payload
+                      from public.oncall_list_cache c
+                     where c.cache_key = p_cache_key
+                       and c.version = v.version)
+    )
+      from public.oncall_rotation_version v
+     where v.id = 1;
+$$;
+
+-- p_version 이 아직 현재 버전이고 저장된 행보다 새로울 때만 저장. 반환: 저장 여부
+create or replace function public.store_oncall_list_cache(p_cache_key text, p_version bigint, p_payload jsonb)
+returns boolean
+language plpgsql
+as $$
+begin
+    if p_version <> (select version from public.oncall_rotation_version where id = 1) then
+        return false;
+    end if;
+
+    insert into public.oncall_list_cache as c (cache_key, payload, version, created_at)
+    values (p_cache_key, p_payload, p_version, now())
+    on conflict (cache_key) do update
+       set payload = excluded.payload, version = excluded.version, created_at = excluded.created_at
+     where c.version < excluded.version;
+    return found;
+end;
+$$;
@@ -0,0 +1,23 @@
+-- 알림 outbox: 행별 발송 시도 횟수 (dead letter)
+-- automation/outbox.py 의 drain 단계가 발송에 실패한 행의 notify_attempts 를 늘리고,
+-- Slack 이 거절(4xx)했거나 OUTBOX_MAX_ATTEMPTS 번 실패한 행은 더 이상 가져오지 않는다.
+-- 다시 보내려면 해당 행의 notify_attempts 를 0 으로 되돌린다.
+-- 20261017000200_notification_outbox 와 함께, outbox 를 사용하는 스크래퍼 코드보다 먼저 배포한다.
+do $$
+declare
+    t text;
+begin
+    foreach t in array array[
+        'dc_posts',
+        'longblack_today_article',
+        'plab_review',
+        'manager_review',
+        'iamground_review',
+        'puzzle_review',
+        'letsgoale_review',
+        'matchup_review'
+    ] loop
+        execute format('alter table public.%I add column if not exists notify_attempts integer not null default 0', t);
+    end loop;
+end;
+$$;
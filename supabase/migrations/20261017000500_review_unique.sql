@@ -0,0 +1,28 @@
+-- 앱 리뷰 테이블: (platform_review_id, platform_type) unique 제약
+-- automation/app_review_scraper.py 가 upsert(on_conflict='platform_review_id,platform_type', ignore_duplicates=True)
+-- 로 저장하므로, 동시에 실행된 스크래퍼가 같은 리뷰를 저장해도 요청 전체가 실패하지 않고 중복만 건너뛴다.
+-- 제약을 만들기 전에 기존 중복 행은 가장 먼저 저장된 행(id 가 가장 작은 행)만 남긴다.
+-- 이 코드보다 먼저 배포한다. (제약이 없으면 on_conflict upsert 가 42P10 오류로 실패한다)
+do $$
+declare
+    t text;
+begin
+    foreach t in array array[
+        'plab_review',
+        'manager_review',
+        'iamground_review',
+        'puzzle_review',
+        'letsgoale_review',
+        'matchup_review'
+    ] loop
+        execute format(
+            'delete from public.%I a using public.%I b
+              where a.platform_review_id = b.platform_review_id
+                and a.platform_type = b.platform_type
+                and a.id > b.id', t, t);
+        execute format(
+            'create unique index if not exists %I on public.%I (platform_review_id, platform_type)',
+            t || '_platform_review_key', t);
+    end loop;
+end;
+$$;
@@ -0,0 +1,77 @@
+"""get_nearest_future_schedules(한 번의 in_ 조회)가 멤버별 조회와 같은 스케줄을 고르는지 확인
+
+실행: python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "api"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import swap_oncall  # noqa: E402
+from fake_supabase import FakeSupabase  # noqa: E402
+
+TODAY = "2026-10-17"
+
+ROWS = [
+    {"date": "2026-10-10", "member": "따오"},  # 지난 스케줄
+    {"date": "2026-10-17", "member": "워즈"},  # 오늘
+    {"date": "2026-10-18", "member": "따오"},
+    {"date": "2026-10-18", "member": "로쿤"},  # 다른 멤버와 같은 날짜
+    {"date": "2026-10-24", "member": "엔도"},
+    {"date": "2026-10-24", "member": "엔도"},  # 같은 멤버가 같은 날짜에 두 번
+    {"date": "2026-10-25", "member": "워즈"},
+    {"date": "2026-10-31", "member": "따오"},
+]
+
+
+def nearest_one_by_one(member, today_str):
+    """멤버별로 조회하던 이전 방식 (멤버당 한 번, 같은 날짜면 id순)"""
+    response = swap_oncall.get_supabase().table('oncall_rotation') \
+        .select('*') \
+        .eq('member', member) \
+        .gte('date', today_str) \
+        .order('date') \
+        .order('id') \
+        .limit(1) \
+        .execute()
+    return response.data[0] if response.data else None
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeSupabase()
+    fake.seed("oncall_rotation", ROWS)
+    monkeypatch.setattr(swap_oncall, "supabase", fake)
+    return fake
+
+
+@pytest.mark.parametrize("members", [
+    ("따오", "로쿤"),    # 같은 날짜의 두 멤버
+    ("워즈", "엔도"),    # 오늘 스케줄 / 같은 날짜에 두 번 있는 멤버
+    ("따오", "없는멤버"),  # 향후 스케줄이 없는 멤버
+    ("엔도", "엔도"),    # 같은 멤버 두 번
+])
+def test_matches_per_member_lookup(fake, members):
+    nearest = swap_oncall.get_nearest_future_schedules(members, TODAY)
+
+    for member in members:
+        assert nearest.get(member) == nearest_one_by_one(member, TODAY)
+    assert set(nearest) <= set(members)
+
+
+def test_single_round_trip(fake):
+    swap_oncall.get_nearest_future_schedules(["따오", "워즈"], TODAY)
+
+    assert fake.round_trips == 1
+
+
+def test_picks_lowest_id_on_same_date(fake):
+    nearest = swap_oncall.get_nearest_future_schedules(["엔도"], TODAY)
+
+    assert nearest["엔도"]["id"] == min(
+        row["id"] for row in fake.tables["oncall_rotation"] if row["member"] == "엔도"
+    )